@@ -3,21 +3,30 @@ Legacy mix routes - isolated from main.py
 """
 
 import os
+import math
 import uuid
-import shutil
-import time
+import wave
+import asyncio
+import threading
 import subprocess
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
+from functools import lru_cache
 
-from fastapi import File, UploadFile, HTTPException, Form, APIRouter
+from fastapi import BackgroundTasks, File, UploadFile, HTTPException, Form, APIRouter
 from pydub import AudioSegment
-from pydub.effects import normalize, compress_dynamic_range, high_pass_filter
-import requests
+import numpy as np
+import scipy.signal as sps
+import soundfile as sf
+import aiofiles
+import orjson
 
 from backend.legacy.mix.models import MixRequest, MixApplyRequest
-from backend.legacy.upload.security import validate_audio_file
+from backend.legacy.upload.security import validate_audio_extension, MAX_AUDIO_BYTES
+from project_memory import record_stage_assets
+from utils.shared_utils import get_http_client, FFMPEG_BIN, FFPROBE_BIN
 
 # Import dependencies from main.py
 # Using lazy imports to avoid circular dependency issues
@@ -26,6 +35,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# numba JIT-compiles the per-sample mix kernels (SIMD + threads); numpy is the fallback
+try:
+    from numba import njit, prange
+    _numba_available = True
+except ImportError:
+    _numba_available = False
+    logger.warning("⚠️ numba package not installed. Mix DSP kernels will fall back to numpy.")
+
 # These will be imported from main when routes are registered
 # We'll import them at function level to avoid circular imports
 
@@ -60,34 +77,262 @@ async def create_mix(request: MixRequest):
 
 
 # ============================================================================
-# 4. POST /mix/run - PYDUB CHAIN + OPTIONAL AUPHONIC
+# 4. POST /mix/run - NUMPY CHAIN + OPTIONAL AUPHONIC
 # ============================================================================
 
+# Rate/layout ffmpeg decodes to when libsndfile can't read a file (the mix resamples as needed)
+FFMPEG_DECODE_SR = 44100
+FFMPEG_DECODE_CHANNELS = 2
+
+
+def _ffmpeg_decode(path: Path) -> Tuple[np.ndarray, int]:
+    """Decode via an ffmpeg pipe straight to float32 PCM - no temp WAV, no int16 round-trip"""
+    result = subprocess.run(
+        [
+            FFMPEG_BIN, "-v", "error", "-nostdin", "-i", str(path),
+            "-f", "f32le", "-ac", str(FFMPEG_DECODE_CHANNELS), "-ar", str(FFMPEG_DECODE_SR), "-"
+        ],
+        capture_output=True,
+        check=True
+    )
+    samples = np.frombuffer(result.stdout, dtype=np.float32).reshape(-1, FFMPEG_DECODE_CHANNELS)
+    return samples, FFMPEG_DECODE_SR
+
+
+def _read_audio(path: Path) -> Tuple[np.ndarray, int]:
+    """Decode an audio file to a float32 (frames, channels) array in [-1, 1]"""
+    try:
+        return sf.read(str(path), dtype='float32', always_2d=True)
+    except RuntimeError:
+        # libsndfile can't read every container we accept (m4a); let ffmpeg decode those
+        return _ffmpeg_decode(path)
+
+
+# Stem file extensions /mix/run picks up from the session's stems/ directory
+AUDIO_EXTS = frozenset({'.wav', '.mp3', '.m4a', '.aiff', '.flac'})
+
+
+def _list_stem_files(stems_path: Path) -> List[Path]:
+    """Audio files directly in stems_path, skipping hidden files and subdirectories"""
+    with os.scandir(stems_path) as entries:
+        return [
+            Path(entry.path) for entry in entries
+            if not entry.name.startswith('.')
+            and os.path.splitext(entry.name)[1].lower() in AUDIO_EXTS
+            and entry.is_file()
+        ]
+
+
+# Decoded stems/beat keyed by (path, mtime_ns): gain tweaks re-run /mix/run on unchanged files.
+# Entries are full float32 buffers (~21 MB per stereo minute at 44.1 kHz), so the cache is
+# bounded by total bytes rather than entry count; the default holds ~12 stereo minutes.
+MIX_AUDIO_CACHE_BYTES = int(os.getenv("MIX_AUDIO_CACHE_MB", "256")) * 1024 * 1024
+_audio_cache: "OrderedDict[Tuple[str, int], Tuple[np.ndarray, int]]" = OrderedDict()
+_audio_cache_bytes = 0
+_audio_cache_lock = threading.Lock()
+
+
+def _load_audio(path: str, mtime_ns: int) -> Tuple[np.ndarray, int]:
+    """Cached _read_audio; the array is shared between requests, so it is returned read-only"""
+    global _audio_cache_bytes
+    key = (path, mtime_ns)
+    with _audio_cache_lock:
+        cached = _audio_cache.get(key)
+        if cached is not None:
+            _audio_cache.move_to_end(key)
+            return cached
+    data, sr = _read_audio(Path(path))
+    data.setflags(write=False)
+    if data.nbytes > MIX_AUDIO_CACHE_BYTES:
+        return data, sr
+    with _audio_cache_lock:
+        if key not in _audio_cache:
+            _audio_cache[key] = (data, sr)
+            _audio_cache_bytes += data.nbytes
+        # Evict least recently used entries until the cache fits its byte budget again
+        while _audio_cache_bytes > MIX_AUDIO_CACHE_BYTES:
+            _, (evicted, _) = _audio_cache.popitem(last=False)
+            _audio_cache_bytes -= evicted.nbytes
+    return data, sr
+
+
+def _load_audio_file(path: Path) -> Tuple[np.ndarray, int]:
+    """_load_audio keyed on the file's current mtime (stats the file, so call it off the event loop)"""
+    return _load_audio(str(path), path.stat().st_mtime_ns)
+
+
+def _write_audio(path: Path, data: np.ndarray, sr: int):
+    """Write float audio as 16-bit PCM; WAV goes straight through libsndfile, lossy formats through ffmpeg"""
+    data = np.clip(data, -1.0, 1.0)
+    if path.suffix.lower() == ".wav":
+        sf.write(str(path), data, sr, format='WAV', subtype='PCM_16')
+        return
+    pcm = (data * 32767).astype(np.int16)
+    AudioSegment(pcm.tobytes(), frame_rate=sr, sample_width=2, channels=pcm.shape[1]).export(
+        str(path), format=path.suffix.lstrip(".").lower()
+    )
+
+
+if _numba_available:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _compress_kernel(x, thr, ratio):
+        frames, channels = x.shape
+        for i in prange(frames):
+            for c in range(channels):
+                v = x[i, c]
+                mag = abs(v)
+                if mag > thr:
+                    x[i, c] = math.copysign(thr + (mag - thr) / ratio, v)
+        return x
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _gain_kernel(x, gain):
+        frames, channels = x.shape
+        for i in prange(frames):
+            for c in range(channels):
+                x[i, c] *= gain
+        return x
+
+    @njit(fastmath=True, cache=True)
+    def _sosfilt_kernel(sos, x):
+        # Transposed direct form II, one pass per second-order section; the
+        # recursion is serial in time so only the arithmetic gets vectorised
+        frames, channels = x.shape
+        for c in range(channels):
+            for s in range(sos.shape[0]):
+                b0, b1, b2, a1, a2 = sos[s, 0], sos[s, 1], sos[s, 2], sos[s, 4], sos[s, 5]
+                z1 = 0.0
+                z2 = 0.0
+                for i in range(frames):
+                    xi = x[i, c]
+                    yi = b0 * xi + z1
+                    z1 = b1 * xi - a1 * yi + z2
+                    z2 = b2 * xi - a2 * yi
+                    x[i, c] = yi
+        return x
+
+    # Compile now (or load from the on-disk cache) so the first mix doesn't pay for it
+    _warmup = np.zeros((16, 2), dtype=np.float32)
+    _compress_kernel(_warmup, 0.1, 3.0)
+    _gain_kernel(_warmup, 1.0)
+    _sosfilt_kernel(sps.butter(2, 0.01, btype='high', output='sos'), _warmup)
+    del _warmup
+
+
+def _highpass(data: np.ndarray, cutoff_hz: float, sr: int) -> np.ndarray:
+    """2nd-order Butterworth high-pass along the time axis; returns a new array"""
+    sos = sps.butter(2, cutoff_hz / (sr / 2), btype='high', output='sos')
+    if _numba_available:
+        return _sosfilt_kernel(sos, np.array(data, dtype=np.float32, order='C'))
+    return sps.sosfilt(sos, data, axis=0).astype(np.float32)
+
+
+def _compress(data: np.ndarray, threshold_db: float, ratio: float) -> np.ndarray:
+    """Static compression curve, in place: everything above the threshold is scaled down by ratio"""
+    thr = 10 ** (threshold_db / 20)
+    if _numba_available and data.flags.c_contiguous:
+        return _compress_kernel(data, thr, float(ratio))
+    mag = np.abs(data)
+    data[:] = np.where(mag > thr, np.sign(data) * (thr + (mag - thr) / ratio), data)
+    return data
+
+
+def _apply_gain(data: np.ndarray, gain_db: float) -> np.ndarray:
+    """Scale by gain_db, in place"""
+    gain = 10 ** (gain_db / 20)
+    if _numba_available and data.flags.c_contiguous:
+        return _gain_kernel(data, gain)
+    data *= np.float32(gain)
+    return data
+
+
+def _write_mix_and_master(mix_file: Path, master_file: Path, mix: np.ndarray, sr: int, headroom_db: float = 0.1):
+    """
+    Write the mix, then peak-normalize the same buffer in place to -headroom_db dBFS
+    (pydub.effects.normalize's default) and write it as the master.
+    The buffer is scanned once for the peak and never copied.
+    """
+    _write_audio(mix_file, mix, sr)
+    peak = float(np.max(np.abs(mix))) if mix.size else 0.0
+    if peak > 0:
+        _apply_gain(mix, -headroom_db - 20 * math.log10(peak))
+    _write_audio(master_file, mix, sr)
+
+
+def _resample(data: np.ndarray, sr: int, target_sr: int) -> np.ndarray:
+    """Polyphase resample along the time axis (pydub's overlay matched rates implicitly)"""
+    if sr == target_sr:
+        return data
+    g = math.gcd(sr, target_sr)
+    return sps.resample_poly(data, target_sr // g, sr // g, axis=0).astype(np.float32)
+
+
+def _overlay(tracks: List[Tuple[np.ndarray, int]], sr: int) -> np.ndarray:
+    """
+    Sum (data, sample_rate) tracks into one zero-padded float32 accumulator at sr.
+    Tracks are resampled one at a time and mono tracks broadcast across the output
+    channels, so the accumulator is the only full-mix allocation.
+    """
+    # ceil(n * sr / track_sr) is exactly resample_poly's output length
+    frames = max(-(-len(data) * sr // track_sr) for data, track_sr in tracks)
+    channels = max(data.shape[1] for data, _ in tracks)
+    mix = np.zeros((frames, channels), dtype=np.float32)
+    for data, track_sr in tracks:
+        data = _resample(data, track_sr, sr)
+        mix[:data.shape[0]] += data
+    return mix
+
+
+def _process_stem(stem_file: Path, request: MixRequest) -> Optional[Tuple[np.ndarray, int]]:
+    """Decode one stem and run the vocal chain on it; None if the file can't be read"""
+    try:
+        data, sr = _load_audio_file(stem_file)
+        logger.info(f"Processing stem: {stem_file.name} ({len(data) * 1000 // sr}ms)")
+    except Exception as e:
+        logger.warning(f"Skipping unreadable stem {stem_file}: {e}")
+        return None
+    
+    # HPF on vocals (80-100 Hz) - also takes the private copy of the cached buffer
+    # that the in-place stages below write into
+    if request.hpf_hz > 0:
+        data = _highpass(data, request.hpf_hz, sr)
+    else:
+        data = data.copy()
+    
+    # Light compression
+    data = _compress(data, threshold_db=-20.0, ratio=3.0)
+    
+    # Simple de-ess (narrow dip 5-7 kHz) - approximated with gain reduction,
+    # folded into the vocal gain so the buffer is only scaled once
+    gain_db = 20 * (request.vocal_gain - 1)
+    if request.deess_amount > 0:
+        gain_db -= request.deess_amount * 3  # Slight reduction
+    
+    return _apply_gain(data, gain_db), sr
+
+
 @mix_router.post("/run")
-async def mix_run(request: MixRequest):
-    """Phase 2.2: Mix beat + stems with pydub chain, always mix vocals even if no beat"""
+async def mix_run(request: MixRequest, background_tasks: BackgroundTasks):
+    """Phase 2.2: Mix beat + stems with a numpy/scipy chain, always mix vocals even if no beat"""
     # Import from main to avoid circular imports
     from main import (
         get_session_media_path, log_endpoint_event, success_response, 
-        error_response, MEDIA_DIR, get_or_create_project_memory
+        error_response, MEDIA_DIR
     )
     import logging
     logger = logging.getLogger(__name__)
     
     session_path = get_session_media_path(request.session_id)
     mix_dir = session_path / "mix"
-    mix_dir.mkdir(exist_ok=True, parents=True)
+    await asyncio.to_thread(mix_dir.mkdir, exist_ok=True, parents=True)
     
     try:
         # Load stems (vocal files)
         stems_path = session_path / "stems"
         stem_files = []
-        if stems_path.exists():
+        if await asyncio.to_thread(stems_path.exists):
             # Get all audio files from stems directory
-            stem_files = [
-                f for f in stems_path.glob("*.*") 
-                if f.suffix.lower() in ('.wav', '.mp3', '.m4a', '.aiff', '.flac')
-            ]
+            stem_files = await asyncio.to_thread(_list_stem_files, stems_path)
         
         if not stem_files:
             logger.warning(f"⚠️ No stems found in {stems_path}")
@@ -100,43 +345,13 @@ async def mix_run(request: MixRequest):
         
         logger.info(f"🎧 Found {len(stem_files)} stem file(s) to mix: {[f.name for f in stem_files]}")
         
-        # Load and process stems
-        mixed_vocals = None
-        for stem_file in stem_files:
-            try:
-                stem = AudioSegment.from_file(str(stem_file))
-                logger.info(f"Processing stem: {stem_file.name} ({len(stem)}ms)")
-            except Exception as e:
-                logger.warning(f"Skipping unreadable stem {stem_file}: {e}")
-                continue
-            
-            # HPF on vocals (80-100 Hz)
-            if request.hpf_hz > 0:
-                stem = high_pass_filter(stem, cutoff=request.hpf_hz)
-            
-            # Light compression
-            stem = compress_dynamic_range(stem, threshold=-20.0, ratio=3.0, attack=5.0, release=50.0)
-            
-            # Simple de-ess (narrow dip 5-7 kHz) - approximate with EQ
-            # Note: pydub doesn't have built-in de-ess, so we simulate with gain reduction
-            if request.deess_amount > 0:
-                stem = stem - (request.deess_amount * 3)  # Slight reduction
-            
-            # Apply gain
-            stem = stem + (20 * (request.vocal_gain - 1))
-            
-            # Combine vocals
-            if mixed_vocals is None:
-                mixed_vocals = stem
-            else:
-                # Ensure equal lengths before overlaying
-                if len(mixed_vocals) < len(stem):
-                    mixed_vocals = mixed_vocals + AudioSegment.silent(duration=len(stem) - len(mixed_vocals))
-                elif len(stem) < len(mixed_vocals):
-                    stem = stem + AudioSegment.silent(duration=len(mixed_vocals) - len(stem))
-                mixed_vocals = mixed_vocals.overlay(stem)
+        # Stems are independent until the overlay, so decode + process them in parallel
+        processed = await asyncio.gather(
+            *(asyncio.to_thread(_process_stem, stem_file, request) for stem_file in stem_files)
+        )
+        tracks = [track for track in processed if track is not None]
         
-        if mixed_vocals is None:
+        if not tracks:
             log_endpoint_event("/mix/run", request.session_id, "error", {"error": "No processable stems"})
             return error_response(
                 "Failed to run mix",
@@ -146,64 +361,51 @@ async def mix_run(request: MixRequest):
         
         # Check if beat exists
         beat_file = session_path / "beat.mp3"
-        has_beat = beat_file.exists()
+        has_beat = await asyncio.to_thread(beat_file.exists)
         
         if has_beat:
             # Load and process beat
-            beat = AudioSegment.from_file(str(beat_file))
-            beat = beat + (20 * (request.beat_gain - 1))  # Apply gain
-            
-            # Ensure equal lengths
-            if len(mixed_vocals) < len(beat):
-                mixed_vocals = mixed_vocals + AudioSegment.silent(duration=len(beat) - len(mixed_vocals))
-            elif len(beat) < len(mixed_vocals):
-                beat = beat + AudioSegment.silent(duration=len(mixed_vocals) - len(beat))
-            
-            # Final mix with beat
-            final_mix = beat.overlay(mixed_vocals)
+            beat, beat_sr = await asyncio.to_thread(_load_audio_file, beat_file)
+            tracks.append((_apply_gain(beat.copy(), 20 * (request.beat_gain - 1)), beat_sr))
             logger.info("Mixing vocals with beat")
         else:
-            # Vocals-only mix
-            final_mix = mixed_vocals
             logger.info("✅ No beat found — mixing vocals only")
         
+        # Mix = sum of all tracks at the highest sample rate among them
+        sr = max(track_sr for _, track_sr in tracks)
+        final_mix = _overlay(tracks, sr)
+        
         # Export mix - maintain backward compatibility for beats, use mix_dir for vocals-only
         if has_beat:
             # Keep original behavior: save to session root for backward compatibility
             mix_file = session_path / "mix.wav"
             mix_url_path = f"/media/{request.session_id}/mix.wav"
-            final_mix.export(str(mix_file), format="wav")
         else:
             # New behavior: vocals-only mixes go to mix directory
             mix_file = mix_dir / "vocals_only_mix.mp3"
             mix_url_path = f"/media/{request.session_id}/mix/vocals_only_mix.mp3"
-            final_mix.export(str(mix_file), format="mp3")
         
         # Auphonic mastering (if key present)
         auphonic_key = os.getenv("AUPHONIC_API_KEY")
         master_file = session_path / "master.wav"
         
         if auphonic_key:
-            try:
-                # TODO: Implement Auphonic API call
-                # For now, use local normalize
-                logger.warning("Auphonic integration pending - using local normalize")
-                mastered = normalize(final_mix)
-                mastered.export(str(master_file), format="wav")
-            except Exception as e:
-                logger.error(f"Auphonic failed, using local: {e}")
-                mastered = normalize(final_mix)
-                mastered.export(str(master_file), format="wav")
-        else:
-            # Local normalize
-            mastered = normalize(final_mix)
-            mastered.export(str(master_file), format="wav")
-        
-        # Update project memory
-        memory = get_or_create_project_memory(request.session_id, MEDIA_DIR)
-        memory.add_asset("mix", mix_url_path, {})
-        memory.add_asset("master", f"/media/{request.session_id}/master.wav", {})
-        memory.advance_stage("mix", "release")
+            # TODO: Implement Auphonic API call
+            # For now, use local normalize
+            logger.warning("Auphonic integration pending - using local normalize")
+        
+        # Mix and local master come from the same buffer (master = mix normalized in place)
+        await asyncio.to_thread(_write_mix_and_master, mix_file, master_file, final_mix, sr)
+        
+        # Update project memory once the response has been sent
+        background_tasks.add_task(
+            record_stage_assets,
+            request.session_id,
+            MEDIA_DIR,
+            [("mix", mix_url_path, {}), ("master", f"/media/{request.session_id}/master.wav", {})],
+            "mix",
+            "release"
+        )
         
         mastering_method = "auphonic" if auphonic_key else "local"
         mix_type = "vocals_only" if not has_beat else "vocals_and_beat"
@@ -243,8 +445,205 @@ async def mix_run(request: MixRequest):
 # V21: POST /mix/process - AI MIX & MASTER WITH DSP PIPELINE
 # ============================================================================
 
+# Uploads and downloads are streamed to disk in 64 KiB chunks
+UPLOAD_CHUNK_SIZE = 1 << 16
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+
+async def _download_to(url: str, dest: Path) -> bool:
+    """Stream url into dest over the shared keep-alive client; False on a non-2xx response"""
+    client = get_http_client()
+    async with client.stream("GET", url, timeout=30, follow_redirects=True) as response:
+        if not response.is_success:
+            return False
+        async with aiofiles.open(dest, 'wb') as f:
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                await f.write(chunk)
+    return True
+
+
+def _probe_wav(path: Path) -> Optional[Dict]:
+    """
+    Read the same fields as _probe_audio straight from a PCM WAV header, without spawning ffprobe.
+    Returns None when the stdlib wave module can't parse the file (extensible/float WAV, not RIFF).
+    """
+    try:
+        with wave.open(str(path), 'rb') as w:
+            sample_rate = w.getframerate()
+            return {
+                "duration_ms": int(w.getnframes() * 1000 / sample_rate) if sample_rate else 0,
+                "sample_rate": sample_rate,
+                "channels": w.getnchannels()
+            }
+    except (wave.Error, EOFError):
+        return None
+
+
+async def _probe_audio(path: Path) -> Optional[Dict]:
+    """
+    Header-only ffprobe of the first audio stream.
+    Returns duration_ms (None if the container doesn't say), sample_rate and channels,
+    or None when there is no audio stream.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        FFPROBE_BIN, '-v', 'error', '-select_streams', 'a:0', '-show_streams', '-show_format', '-of', 'json',
+        '-i', str(path),
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=10)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    info = orjson.loads(stdout or b"{}")
+    streams = info.get("streams") or []
+    if not streams:
+        return None
+    stream = streams[0]
+    duration = stream.get("duration") or info.get("format", {}).get("duration")
+    return {
+        "duration_ms": int(float(duration) * 1000) if duration not in (None, "N/A") else None,
+        "sample_rate": int(stream.get("sample_rate") or 0),
+        "channels": int(stream.get("channels") or 0)
+    }
+
+
+# Temp inputs are deleted by a background janitor after the response is sent
+_cleanup_queue: asyncio.Queue = asyncio.Queue()
+_cleanup_worker: Optional[asyncio.Task] = None
+
+
+async def _run_cleanup():
+    """Unlink queued temp files one at a time, off the request path"""
+    while True:
+        path = await _cleanup_queue.get()
+        try:
+            await asyncio.to_thread(path.unlink, missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Failed to remove temp file {path}: {e}")
+        finally:
+            _cleanup_queue.task_done()
+
+
+def _schedule_cleanup(path: Path):
+    """Queue a temp file for deletion, starting the janitor on first use"""
+    global _cleanup_worker
+    if _cleanup_worker is None or _cleanup_worker.done():
+        _cleanup_worker = asyncio.create_task(_run_cleanup())
+    _cleanup_queue.put_nowait(path)
+
+
+# Admission control for /mix/process: each ffmpeg already fans out across cores, so
+# running more than a few at once only thrashes; extra requests wait for a slot
+_dsp_slots = asyncio.Semaphore(int(os.getenv("MIX_MAX_CONCURRENCY", str(max(2, (os.cpu_count() or 2) // 2)))))
+
+
+async def _run_dsp(cmd: List[str], timeout: float = 120):
+    """
+    Run an ffmpeg DSP command as an async subprocess once a slot is free.
+    Raises CalledProcessError on failure; killed after timeout seconds.
+    """
+    async with _dsp_slots:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+
+
+def _file_size(path: Path) -> int:
+    """Size in bytes, 0 if the file doesn't exist"""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+
+@lru_cache(maxsize=1)
+def _ffmpeg_has_stereotools() -> bool:
+    """Whether the installed ffmpeg ships the stereotools filter - probed once per process"""
+    try:
+        result = subprocess.run([FFMPEG_BIN, "-hide_banner", "-filters"], capture_output=True, timeout=5)
+        return "stereotools" in result.stdout.decode('utf-8', errors='ignore')
+    except Exception:
+        return False
+
+
+# Chains depend only on these parameters; memoised so preset mixes (and repeated slider
+# settings) skip rebuilding the filter strings
+@lru_cache(maxsize=256)
+def _build_filter_chain(eq_low_gain: float, eq_mid_gain: float, eq_high_gain: float,
+                        compression_val: float, reverb_val: float, stereotools: bool) -> str:
+    """ffmpeg -af chain for the /mix/process DSP settings"""
+    # Stage 1: EQ (3-band) - bands at ~0 dB are skipped below
+    eq_low_filter = f"equalizer=f=100:t=lowshelf:g={eq_low_gain}"
+    eq_mid_filter = f"equalizer=f=1500:t=peak:g={eq_mid_gain}:width=2"
+    eq_high_filter = f"equalizer=f=10000:t=highshelf:g={eq_high_gain}"
+    
+    # Stage 2: Compression (acompressor - closed-form envelope follower, cheaper per sample than compand)
+    # Map compression slider (0-1) to ratio 1:1-5:1 above -20 dBFS, with 0-3 dB makeup gain
+    # compression 0 = no compression, 1 = full compression
+    compressor_ratio = 1 + compression_val * 4
+    compressor_makeup = 10 ** (compression_val * 3 / 20)  # acompressor takes linear makeup (1-64)
+    compressor_filter = (
+        f"acompressor=threshold=0.1:ratio={compressor_ratio:.2f}"
+        f":attack=10:release=200:makeup={compressor_makeup:.3f}"
+    )
+    
+    # Stage 3: Reverb (aecho)
+    # FIX 1: Reverb delay MUST be integer - map slider (0-1) → delay in ms (20-60), decay 0.2-0.8
+    delay_ms = int(20 + (reverb_val * 40))  # always integer between 20 and 60
+    decay = 0.2 + (reverb_val * 0.6)  # 0.2-0.8 (decay can be float)
+    # Note: FFmpeg aecho takes delay in seconds, but user spec shows delay_ms directly
+    # Convert milliseconds to seconds for FFmpeg (delay_ms is already integer)
+    aecho_filter = f"aecho=0.8:0.88:{delay_ms/1000.0}:{decay}"
+    
+    # Stage 4: Limiting happens once, after loudnorm (master_filter) - a pre-loudnorm
+    # limiter was undone by loudnorm's gain change and re-clipped by the master stage
+    
+    # Stage 5: Final Mastering Chain (always apply)
+    # FIX 3: Stereotools is optional - only used when the installed ffmpeg has it
+    stereo_filter = "stereotools=mlev=1.05" if stereotools else ""
+    
+    master_filter = "alimiter=limit=0.98"
+    
+    # FIX 4: Build filter chain safely - remove empty filters, no trailing commas
+    # Stages that would be no-ops for these settings are left out of the graph entirely
+    filters = []
+    if abs(eq_low_gain) > 0.05:
+        filters.append(eq_low_filter)
+    if abs(eq_mid_gain) > 0.05:
+        filters.append(eq_mid_filter)
+    if abs(eq_high_gain) > 0.05:
+        filters.append(eq_high_filter)
+    if compression_val > 0.01:
+        filters.append(compressor_filter)
+    if reverb_val > 0.01:
+        filters.append(aecho_filter)
+    if stereo_filter:
+        filters.append(stereo_filter)
+    filters.append("loudnorm=I=-13:TP=-1:LRA=7")
+    filters.append(master_filter)
+    
+    # Remove empty filters to avoid empty commas in chain
+    return ",".join([f for f in filters if f])
+
+
 @mix_router.post("/process")
 async def mix_process(
+    background_tasks: BackgroundTasks,
     file: Optional[UploadFile] = File(None),
     file_url: Optional[str] = Form(None),
     session_id: str = Form(...),
@@ -266,16 +665,17 @@ async def mix_process(
     # Import from main to avoid circular imports
     from main import (
         get_session_media_path, log_endpoint_event, success_response,
-        error_response, MEDIA_DIR, get_or_create_project_memory
+        error_response, MEDIA_DIR
     )
     import logging
     logger = logging.getLogger(__name__)
     
     session_path = get_session_media_path(session_id)
     mix_dir = session_path / "mix"
-    mix_dir.mkdir(exist_ok=True, parents=True)
+    await asyncio.to_thread(mix_dir.mkdir, exist_ok=True, parents=True)
     
     input_file_path = None
+    temp_input = None  # only inputs this request wrote are cleaned up, never a referenced stem
     output_file = mix_dir / "mixed_mastered.wav"
     output_url = f"/media/{session_id}/mix/mixed_mastered.wav"
     
@@ -284,18 +684,29 @@ async def mix_process(
         if file and file.filename:
             # Phase 1: Centralized audio validation
             try:
-                await validate_audio_file(file)
+                input_ext = validate_audio_extension(file)
             except HTTPException as he:
                 return error_response(
                     "Failed to process mix",
                     status_code=500,
                     data={"session_id": session_id}
                 )
-            # Save uploaded file temporarily
-            input_file_path = mix_dir / f"temp_input_{uuid.uuid4().hex[:8]}{Path(file.filename).suffix}"
-            content = await file.read()
-            with open(input_file_path, 'wb') as f:
-                f.write(content)
+            # Save uploaded file temporarily, streaming so memory stays bounded by one chunk
+            input_file_path = temp_input = mix_dir / f"temp_input_{uuid.uuid4().hex[:8]}{input_ext}"
+            size = 0
+            async with aiofiles.open(input_file_path, 'wb') as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > MAX_AUDIO_BYTES:
+                        break
+                    await f.write(chunk)
+            if size == 0 or size > MAX_AUDIO_BYTES:
+                # Empty or over the size cap; the partial file is removed in finally
+                return error_response(
+                    "Failed to process mix",
+                    status_code=500,
+                    data={"session_id": session_id}
+                )
         elif file_url:
             # Fetch file from URL (can be absolute URL or relative path)
             try:
@@ -303,35 +714,27 @@ async def mix_process(
                 if file_url.startswith('/'):
                     # Convert to absolute path
                     file_path = Path('.' + file_url)
-                    if file_path.exists():
+                    if await asyncio.to_thread(file_path.exists):
                         input_file_path = file_path
                     else:
                         # Try fetching from server URL
                         base_url = f"http://localhost:8000{file_url}"
-                        response = requests.get(base_url, timeout=30, stream=True)
-                        if not response.ok:
+                        input_file_path = temp_input = mix_dir / f"temp_input_{uuid.uuid4().hex[:8]}.wav"
+                        if not await _download_to(base_url, input_file_path):
                             return error_response(
                                 "Failed to process mix",
                                 status_code=500,
                                 data={"session_id": session_id}
                             )
-                        input_file_path = mix_dir / f"temp_input_{uuid.uuid4().hex[:8]}.wav"
-                        with open(input_file_path, 'wb') as f:
-                            for chunk in response.iter_content(chunk_size=8192):
-                                f.write(chunk)
                 else:
                     # Absolute URL
-                    response = requests.get(file_url, timeout=30, stream=True)
-                    if not response.ok:
+                    input_file_path = temp_input = mix_dir / f"temp_input_{uuid.uuid4().hex[:8]}.wav"
+                    if not await _download_to(file_url, input_file_path):
                         return error_response(
                             "Failed to process mix",
                             status_code=500,
                             data={"session_id": session_id}
                         )
-                    input_file_path = mix_dir / f"temp_input_{uuid.uuid4().hex[:8]}.wav"
-                    with open(input_file_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
             except Exception as e:
                 logger.error(f"Failed to fetch file from URL: {e}")
                 return error_response(
@@ -346,30 +749,27 @@ async def mix_process(
                 data={"session_id": session_id}
             )
         
-        if not input_file_path or not input_file_path.exists():
+        if not input_file_path or not await asyncio.to_thread(input_file_path.exists):
             return error_response(
                 "Failed to process mix",
                 status_code=500,
                 data={"session_id": session_id}
             )
         
-        # V21: Validate audio file with pydub
+        # V21: Validate audio file from its headers - no full decode; plain PCM WAV needs no ffprobe
         try:
-            audio = AudioSegment.from_file(str(input_file_path))
-            if len(audio) == 0:
-                if input_file_path.exists():
-                    input_file_path.unlink()
+            audio_info = None
+            if input_file_path.suffix.lower() == '.wav':
+                audio_info = await asyncio.to_thread(_probe_wav, input_file_path)
+            if audio_info is None:
+                audio_info = await _probe_audio(input_file_path)
+            if audio_info is None or audio_info["duration_ms"] == 0:
                 return error_response(
                     "Failed to process mix",
                     status_code=500,
                     data={"session_id": session_id}
                 )
         except Exception as e:
-            if input_file_path.exists():
-                try:
-                    input_file_path.unlink()
-                except:
-                    pass
             logger.error(f"Audio validation failed: {e}")
             return error_response(
                 "Failed to process mix",
@@ -377,7 +777,7 @@ async def mix_process(
                 data={"session_id": session_id}
             )
         
-        logger.info(f"🎧 Processing audio: {len(audio)}ms, sample_rate={audio.frame_rate}")
+        logger.info(f"🎧 Processing audio: {audio_info['duration_ms']}ms, sample_rate={audio_info['sample_rate']}")
         
         # V25: Validate DSP parameters
         eq_low_gain = max(-6.0, min(6.0, eq_low))
@@ -413,104 +813,56 @@ async def mix_process(
         # V25.1: REAL DSP PIPELINE using ffmpeg filters (V25 spec)
         # Build filter chain as single ffmpeg command
         
-        # Stage 1: EQ (3-band) - always apply
-        eq_low_filter = f"equalizer=f=100:t=lowshelf:g={eq_low_gain}"
-        eq_mid_filter = f"equalizer=f=1500:t=peak:g={eq_mid_gain}:width=2"
-        eq_high_filter = f"equalizer=f=10000:t=highshelf:g={eq_high_gain}"
-        
-        # Stage 2: Compression (compand)
-        # FIX 2: Cast to integer - compand 'points=' must not contain floats
-        # Map compression slider (0-1) to compand threshold
-        # compression 0 = no compression, 1 = full compression
-        mix_strength_db_int = int(abs(-10.0 - (compression_val * 10.0)))  # Cast compand threshold to int
-        compand_filter = f"compand=attacks=0.01:decays=0.2:points=-90/-90|-20/-20|-10/-{mix_strength_db_int}|0/0"
-        
-        # Stage 3: Reverb (aecho)
-        # FIX 1: Reverb delay MUST be integer - map slider (0-1) → delay in ms (20-60), decay 0.2-0.8
-        delay_ms = int(20 + (reverb_val * 40))  # always integer between 20 and 60
-        decay = 0.2 + (reverb_val * 0.6)  # 0.2-0.8 (decay can be float)
-        # Note: FFmpeg aecho takes delay in seconds, but user spec shows delay_ms directly
-        # Convert milliseconds to seconds for FFmpeg (delay_ms is already integer)
-        aecho_filter = f"aecho=0.8:0.88:{delay_ms/1000.0}:{decay}"
-        
-        # Stage 4: Limiter (per slider)
-        limiter_filter = "alimiter=limit=0.95:level=1"
-        
-        # Stage 5: Final Mastering Chain (always apply)
         # FIX 3: Stereotools is optional - check availability first
-        stereo_filter = ""
-        try:
-            # Test if stereotools is available in FFmpeg
-            test_result = subprocess.run(
-                ["ffmpeg", "-filters"],
-                capture_output=True,
-                timeout=5
-            )
-            if "stereotools" in test_result.stdout.decode('utf-8', errors='ignore'):
-                stereo_filter = "stereotools=mlev=1.05"
-        except:
-            stereo_filter = ""
-        
-        master_filter = "alimiter=limit=0.98"
-        
-        # FIX 4: Build filter chain safely - remove empty filters, no trailing commas
-        filters = [eq_low_filter, eq_mid_filter, eq_high_filter, compand_filter, aecho_filter, limiter_filter]
-        if stereo_filter:
-            filters.append(stereo_filter)
-        filters.append("loudnorm=I=-13:TP=-1:LRA=7")
-        filters.append(master_filter)
-        
-        # Remove empty filters to avoid empty commas in chain
-        filter_chain = ",".join([f for f in filters if f])
+        has_stereotools = await asyncio.to_thread(_ffmpeg_has_stereotools)
+        filter_chain = _build_filter_chain(
+            eq_low_gain, eq_mid_gain, eq_high_gain, compression_val, reverb_val, has_stereotools
+        )
         
         # V25.1: Execute DSP chain with ffmpeg (single command)
-        temp_processed = mix_dir / f"temp_processed_{uuid.uuid4().hex[:8]}.wav"
+        # Rendered next to the final file and renamed over it, so readers never see a partial WAV
+        # Per-request name: concurrent mixes in one session must not share (and truncate) a .part file
+        partial_output = output_file.with_suffix(f".{uuid.uuid4().hex[:8]}.wav.part")
         
         # Build ffmpeg command with filter chain
+        # Let the decoder and slice-threaded filters (equalizer, loudnorm) use every core
         cmd = [
-            'ffmpeg', '-i', str(input_file_path),
+            FFMPEG_BIN, '-hide_banner', '-loglevel', 'error',
+            '-filter_threads', str(os.cpu_count() or 1),
+            '-threads', '0', '-i', str(input_file_path),
             '-af', filter_chain,
+            # Output is 44.1 kHz stereo. -ar is always needed: loudnorm's dynamic mode upsamples
+            # to 192 kHz, so even a 44.1 kHz input must be resampled back. Remix only when needed.
             '-ar', '44100',
-            '-ac', '2',  # Ensure stereo output
-            '-y', str(temp_processed)
+            *(['-ac', '2'] if audio_info['channels'] != 2 else []),
+            # Only the first audio stream: skip cover art / subtitle / data streams
+            '-map', '0:a:0', '-vn', '-sn', '-dn',
+            '-c:a', 'pcm_s16le', '-f', 'wav',  # explicit: ffmpeg can't infer a muxer from .part
+            '-y', str(partial_output)
         ]
         
         try:
-            result = subprocess.run(cmd, capture_output=True, check=True, timeout=120)
-            if not temp_processed.exists():
+            await _run_dsp(cmd)
+            if not await asyncio.to_thread(partial_output.exists):
                 raise Exception("FFmpeg output file not created")
-            # Move to final output
-            shutil.move(str(temp_processed), str(output_file))
+            # Atomic rename into place (same directory, so always the same filesystem)
+            await asyncio.to_thread(os.replace, partial_output, output_file)
             
             # FIX 5: Guarantee output file exists before returning
-            # Wait for file to exist and have content (up to 400ms)
-            for _ in range(20):  # wait up to 400ms
-                if os.path.exists(output_file) and os.path.getsize(output_file) > 1000:
-                    break
-                time.sleep(0.02)
-            
-            # Final check - raise error if file still missing
-            if not os.path.exists(output_file) or os.path.getsize(output_file) == 0:
+            # The rename has completed by the time it returns, so one stat is enough
+            output_size = await asyncio.to_thread(_file_size, output_file)
+            if output_size == 0:
                 raise RuntimeError("Output file missing or empty after DSP chain")
             
-            logger.info(f"✅ DSP chain applied: {len(filters)} filters")
+            logger.info(f"✅ DSP chain applied: {filter_chain.count(',') + 1} filters")
         except (subprocess.CalledProcessError, FileNotFoundError, Exception) as e:
             logger.error(f"FFmpeg DSP chain failed: {e}")
-            if temp_processed.exists():
-                temp_processed.unlink()
+            await asyncio.to_thread(partial_output.unlink, missing_ok=True)
             # FIX 6: Remove fallback copy - raise error instead
             raise RuntimeError(f"DSP chain failed: {e}")
         
-        # Clean up temp input file
-        if input_file_path and input_file_path.exists() and input_file_path != output_file:
-            try:
-                input_file_path.unlink()
-            except:
-                pass
-        
-        # V25.1: Update project memory (removed mixCompleted)
-        memory = get_or_create_project_memory(session_id, MEDIA_DIR)
-        memory.add_asset("mix", output_url, {
+        # V25.1: Update project memory (removed mixCompleted) - written after the response is sent
+        background_tasks.add_task(record_stage_assets, session_id, MEDIA_DIR, [("mix", output_url, {
             "ai_mix": ai_mix,
             "ai_master": ai_master,
             "preset": preset,
@@ -522,11 +874,16 @@ async def mix_process(
             "compression": compression_val,
             "reverb": reverb_val,
             "limiter": limiter_val
-        })
-        
-        logger.info(f"✅ Mix & master completed - preset={preset}, ai_mix={ai_mix}, ai_master={ai_master}")
-        logger.info(f"📁 Processed file saved to: {output_url}")
-        logger.info(f"🎛️ DSP params: EQ({eq_low_gain:.1f}/{eq_mid_gain:.1f}/{eq_high_gain:.1f}) Comp={compression_val:.2f} Rev={reverb_val:.2f} Lim={limiter_val:.2f}")
+        })])
+        
+        # One record, formatted lazily only if INFO is enabled
+        logger.info(
+            "✅ Mix & master completed - preset=%s, ai_mix=%s, ai_master=%s\n"
+            "📁 Processed file saved to: %s\n"
+            "🎛️ DSP params: EQ(%.1f/%.1f/%.1f) Comp=%.2f Rev=%.2f Lim=%.2f",
+            preset, ai_mix, ai_master, output_url,
+            eq_low_gain, eq_mid_gain, eq_high_gain, compression_val, reverb_val, limiter_val
+        )
         
         log_endpoint_event("/mix/process", session_id, "success", {
             "preset": preset,
@@ -562,9 +919,6 @@ async def mix_process(
         )
     finally:
         # Cleanup temp files
-        if input_file_path and input_file_path.exists() and input_file_path != output_file:
-            try:
-                input_file_path.unlink()
-            except:
-                pass
+        if temp_input:
+            _schedule_cleanup(temp_input)
 
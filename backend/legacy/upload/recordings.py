@@ -3,16 +3,34 @@ Legacy upload endpoint for vocal recordings
 Moved from main.py to isolate legacy upload code
 """
 
+import os
 import uuid
+import asyncio
+import subprocess
 from pathlib import Path
 from typing import Optional
 from datetime import datetime, timezone
 
-from fastapi import File, UploadFile, Form, HTTPException
-from pydub import AudioSegment
+import aiofiles
+from fastapi import BackgroundTasks, File, UploadFile, Form, HTTPException
 
-from project_memory import get_or_create_project_memory
-from backend.legacy.upload.security import validate_audio_file
+from project_memory import record_stage_assets
+from backend.legacy.upload.security import validate_audio_extension, MAX_AUDIO_BYTES
+from utils.shared_utils import FFPROBE_BIN
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def probe_audio_duration(file_path: Path) -> float:
+    """
+    Return the container duration in seconds using ffprobe.
+    Reads only format/stream headers; raises if ffprobe can't parse the file.
+    """
+    result = subprocess.run(
+        [FFPROBE_BIN, "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", str(file_path)],
+        capture_output=True, text=True, timeout=5, check=True
+    )
+    return float(result.stdout.strip())
 
 # These will be imported from main.py when this module is loaded
 # We'll import them at the bottom after main.py is fully loaded to avoid circular imports
@@ -22,17 +40,22 @@ def setup_upload_recording_endpoint(api, get_session_media_path, MEDIA_DIR, log_
     Setup the upload_recording endpoint on the provided api router
     """
     @api.post("/recordings/upload")
-    async def upload_recording(file: UploadFile = File(...), session_id: Optional[str] = Form(None)):
+    async def upload_recording(
+        background_tasks: BackgroundTasks,
+        file: UploadFile = File(...),
+        session_id: Optional[str] = Form(None)
+    ):
         """V20: Upload vocal recording with comprehensive validation"""
         session_id = session_id if session_id else str(uuid.uuid4())
         session_path = get_session_media_path(session_id)
         stems_path = session_path / "stems"
         stems_path.mkdir(exist_ok=True, parents=True)
+        temp_path = None
         
         try:
-            # Phase 1: Centralized audio validation
+            # Phase 1: Centralized audio validation (size is enforced below while streaming)
             try:
-                await validate_audio_file(file)
+                validate_audio_extension(file)
             except HTTPException as he:
                 log_endpoint_event("/recordings/upload", session_id, "error", {"error": he.detail})
                 return error_response(
@@ -40,21 +63,39 @@ def setup_upload_recording_endpoint(api, get_session_media_path, MEDIA_DIR, log_
                     status_code=500,
                     data={"session_id": session_id}
                 )
-            # Read file bytes for subsequent operations
-            content = await file.read()
             
-            # V20: Save file temporarily to validate with pydub
+            # V20: Stream the upload to disk in 1 MiB chunks, enforcing the size cap as bytes arrive.
+            # Written to a per-request temp name and moved over the target only once validated,
+            # so a rejected upload never truncates or deletes an existing stem of the same name.
             file_path = stems_path / file.filename
-            with open(file_path, 'wb') as f:
-                f.write(content)
+            temp_path = file_path.with_name(f"{file_path.name}.{uuid.uuid4().hex[:8]}.part")
+            size = 0
+            size_error = None
+            async with aiofiles.open(temp_path, 'wb') as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > MAX_AUDIO_BYTES:
+                        size_error = "File size exceeds 50MB limit"
+                        break
+                    await f.write(chunk)
+            if size == 0:
+                size_error = "Empty file uploaded"
+            if size_error:
+                await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+                log_endpoint_event("/recordings/upload", session_id, "error", {"error": size_error})
+                return error_response(
+                    "Failed to upload recording",
+                    status_code=500,
+                    data={"session_id": session_id}
+                )
             
-            # V20: Validate file is actual audio by trying to load with pydub
+            # V20: Validate file is actual audio by probing its headers (no full decode)
             try:
-                audio_segment = AudioSegment.from_file(str(file_path))
+                duration = await asyncio.to_thread(probe_audio_duration, temp_path)
                 # Check if audio has any duration (even if very short)
-                if len(audio_segment) == 0:
+                if duration <= 0:
                     # Clean up invalid file
-                    file_path.unlink()
+                    await asyncio.to_thread(temp_path.unlink)
                     log_endpoint_event("/recordings/upload", session_id, "error", {"error": "Corrupted audio"})
                     return error_response(
                         "Failed to upload recording",
@@ -64,7 +105,7 @@ def setup_upload_recording_endpoint(api, get_session_media_path, MEDIA_DIR, log_
             except Exception as audio_error:
                 # Clean up invalid file
                 try:
-                    file_path.unlink()
+                    await asyncio.to_thread(temp_path.unlink)
                 except:
                     pass
                 log_endpoint_event("/recordings/upload", session_id, "error", {"error": f"Audio validation failed: {str(audio_error)}"})
@@ -74,17 +115,21 @@ def setup_upload_recording_endpoint(api, get_session_media_path, MEDIA_DIR, log_
                     data={"session_id": session_id}
                 )
             
-            # V20: File is valid, update project memory
-            memory = get_or_create_project_memory(session_id, MEDIA_DIR)
+            # Validated: atomically move the upload into place (same directory, same filesystem)
+            await asyncio.to_thread(os.replace, temp_path, file_path)
+            
+            # V20: File is valid, update project memory once the response has been sent
             final_url = f"/media/{session_id}/stems/{file.filename}"
-            memory.add_asset(
-                asset_type="stems",
-                file_url=final_url,
-                metadata={"filename": file.filename, "size": len(content)}
+            background_tasks.add_task(
+                record_stage_assets,
+                session_id,
+                MEDIA_DIR,
+                [("stems", final_url, {"filename": file.filename, "size": size})],
+                "upload",
+                "mix"
             )
-            memory.advance_stage("upload", "mix")
             
-            log_endpoint_event("/recordings/upload", session_id, "success", {"filename": file.filename, "size": len(content)})
+            log_endpoint_event("/recordings/upload", session_id, "success", {"filename": file.filename, "size": size})
             
             # V20: Return file_url in success response
             return success_response(
@@ -99,6 +144,8 @@ def setup_upload_recording_endpoint(api, get_session_media_path, MEDIA_DIR, log_
             )
         
         except Exception as e:
+            if temp_path is not None:
+                await asyncio.to_thread(temp_path.unlink, missing_ok=True)
             log_endpoint_event("/recordings/upload", session_id, "error", {"error": str(e)})
             return error_response(
                 "Failed to upload recording",
@@ -4,7 +4,9 @@ Manages project state machine and auto-save/load functionality
 """
 
 import json
+import mmap
 import os
+import uuid
 import asyncio
 import shutil
 from pathlib import Path
@@ -12,9 +14,21 @@ from datetime import datetime
 from typing import Dict, Optional, Any
 import logging
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 
+def _read_json_mmap(path: Path) -> Dict:
+    """Parse a JSON file from a read-only mmap, skipping the intermediate read buffer"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap rejects empty files; orjson raises a json.JSONDecodeError subclass
+            return orjson.loads(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
 class ProjectOrchestrator:
     """
     Orchestrates project state across all stages.
@@ -46,8 +60,7 @@ class ProjectOrchestrator:
                 return default
             
             try:
-                with open(self.project_path, 'r', encoding='utf-8') as f:
-                    data = await asyncio.to_thread(json.load, f)
+                data = await asyncio.to_thread(_read_json_mmap, self.project_path)
                 
                 if "user_id" not in data:
                     data["user_id"] = self.user_id
@@ -79,9 +92,10 @@ class ProjectOrchestrator:
         
         async with self._lock:
             try:
-                temp_path = self.project_path.with_suffix(".json.tmp")
-                with open(temp_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=4)
+                # Unique name: ProjectMemory.save writes the same project.json from other tasks
+                temp_path = self.project_path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+                with open(temp_path, "wb") as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
                     f.flush()
                     os.fsync(f.fileno())
                 os.replace(temp_path, self.project_path)
@@ -3,8 +3,13 @@ Release Service for Label-in-a-Box - PHASE 5
 Builds standardized release packs with metadata, cover art, and audio.
 """
 
+import hashlib
 import json
 import logging
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Dict, Optional
 from datetime import datetime
@@ -23,6 +28,40 @@ from backend.release.utils import sanitize_filename
 
 logger = logging.getLogger(__name__)
 
+# Analysis results keyed by the audio file's path/size/mtime, so rebuilding a release
+# for an unchanged mix skips the full decode
+ANALYSIS_CACHE_DIR = Path("./media") / "_cache" / "analysis"
+
+# Shared cover-render workers; each render holds a few 3000x3000 frames, so keep the pool small
+_cover_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("RELEASE_COVER_WORKERS", str(max(1, (os.cpu_count() or 2) // 2)))),
+    thread_name_prefix="release-cover"
+)
+
+
+def _fast_copy(src: Path, dst: Path):
+    """
+    copy2 through copy_file_range: XFS/Btrfs clone the extents (reflink), other filesystems
+    copy inside the kernel. Not a hard link - the mixer rewrites mix.wav/master.wav in place,
+    which would silently change the release copy too.
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(src, dst)
+        return
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError:
+        # Cross-device on older kernels, or a filesystem without support
+        shutil.copy2(src, dst)
+        return
+    shutil.copystat(src, dst)
+
 
 class ReleaseService:
     """
@@ -81,27 +120,39 @@ class ReleaseService:
             safe_title = sanitize_filename(title)
             safe_artist = sanitize_filename(artist)
             
-            # 1. Copy/rename audio file
-            audio_filename = f"{safe_artist}_{safe_title}.wav"
-            audio_path = release_dir / audio_filename
-            logger.info(f"Copying audio to {audio_path}")
-            if mixed_file_path != audio_path:
-                import shutil
-                shutil.copy2(mixed_file_path, audio_path)
-            logger.info(f"Audio saved to {audio_path}")
-            
-            # 2. Analyze audio for metadata
-            audio_analysis = self._analyze_audio(audio_path)
-            
-            # 3. Generate cover art
+            # Render the cover on a worker thread while the audio is copied and analysed here;
+            # the two don't depend on each other and Pillow/numpy release the GIL in their C loops
             cover_path = release_dir / "cover.png"
-            cover_result = self.cover_generator.generate_cover(
+            cover_future = _cover_pool.submit(
+                self.cover_generator.generate_cover,
                 track_title=title,
                 artist_name=artist,
                 output_path=cover_path,
                 cover_prompt=cover_prompt
             )
             
+            try:
+                # 1. Copy/rename audio file
+                audio_filename = f"{safe_artist}_{safe_title}.wav"
+                audio_path = release_dir / audio_filename
+                if mixed_file_path != audio_path and not self._is_current_copy(mixed_file_path, audio_path):
+                    logger.info(f"Copying audio to {audio_path}")
+                    _fast_copy(mixed_file_path, audio_path)
+                    logger.info(f"Audio saved to {audio_path}")
+                else:
+                    logger.info(f"Audio already up to date at {audio_path}")
+                
+                # 2. Analyze audio for metadata
+                audio_analysis = self._analyze_audio(audio_path)
+            except Exception:
+                # Don't return while the render is still writing cover.png
+                if not cover_future.cancel():
+                    wait([cover_future])
+                raise
+            
+            # 3. Wait for the cover art
+            cover_result = cover_future.result()
+            
             if not cover_result.get("ok"):
                 return {"ok": False, "error": "COVER_GENERATION_FAILED", "details": cover_result.get("error")}
             
@@ -159,6 +210,16 @@ class ReleaseService:
             logger.error(f"Release pack build failed: {e}", exc_info=True)
             return {"ok": False, "error": str(e)}
     
+    @staticmethod
+    def _is_current_copy(src: Path, dst: Path) -> bool:
+        """True if dst is a copy2 of src's current contents (copy2 carries the mtime over)"""
+        try:
+            src_stat = src.stat()
+            dst_stat = dst.stat()
+        except OSError:
+            return False
+        return src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+    
     def _analyze_audio(self, audio_path: Path) -> Dict:
         """
         Analyze audio file to compute loudness, peak, RMS.
@@ -169,6 +230,16 @@ class ReleaseService:
         Returns:
             Dict with duration_ms, loudness_dBFS, peak_dBFS, rms
         """
+        cache_file = None
+        try:
+            stat = audio_path.stat()
+            key = hashlib.sha256(f"{audio_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+            cache_file = ANALYSIS_CACHE_DIR / f"{key}.json"
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass  # not cached yet (or unreadable): analyse below
+        
         if AudioSegment is None:
             logger.warning("pydub not available, using default audio analysis values")
             return {
@@ -215,13 +286,25 @@ class ReleaseService:
             else:
                 peak_dBFS = -120.0
             
-            return {
+            analysis = {
                 "duration_ms": duration_ms,
                 "loudness_dBFS": round(loudness_dBFS, 2),
                 "peak_dBFS": round(peak_dBFS, 2),
                 "rms": round(rms, 4)
             }
             
+            if cache_file is not None:
+                try:
+                    ANALYSIS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    temp_file = cache_file.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+                    with open(temp_file, 'w', encoding='utf-8') as f:
+                        json.dump(analysis, f)
+                    os.replace(temp_file, cache_file)
+                except OSError as e:
+                    logger.warning(f"Could not cache audio analysis: {e}")
+            
+            return analysis
+            
         except Exception as e:
             logger.error(f"Audio analysis failed: {e}")
             # Return defaults on error
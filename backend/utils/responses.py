@@ -1,8 +1,18 @@
+from typing import Any
+
+import orjson
 from fastapi.responses import JSONResponse
 
 
+class OrjsonJSONResponse(JSONResponse):
+    """JSONResponse that serializes with orjson (same options FastAPI's ORJSONResponse used)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
 def success_response(data=None, message="OK", status=200):
-    return JSONResponse(
+    return OrjsonJSONResponse(
         status_code=status,
         content={
             "ok": True,
@@ -14,7 +24,7 @@ def success_response(data=None, message="OK", status=200):
 
 
 def error_response(error_code, status=400, message="An error occurred", data=None):
-    return JSONResponse(
+    return OrjsonJSONResponse(
         status_code=status,
         content={
             "ok": False,
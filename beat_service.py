@@ -2,19 +2,25 @@
 Beat Service - Business logic for beat generation
 """
 import os
+import math
 import uuid
+import random
 import shutil
 import asyncio
 import logging
+import time
 from pathlib import Path
 from typing import Optional, Dict, Any
 import httpx
+import aiofiles
+import orjson
 from pydub import AudioSegment
 
 from project_memory import get_or_create_project_memory
 from backend.orchestrator import ProjectOrchestrator
 from backend.utils.responses import success_response, error_response
 from utils.helpers import get_session_media_path, log_endpoint_event
+from utils.shared_utils import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +28,132 @@ logger = logging.getLogger(__name__)
 MEDIA_DIR = Path("./media")
 ASSETS_DIR = Path("./assets")
 
+# Beatoven polling: exponential backoff with jitter, bounded by an overall deadline
+BEATOVEN_POLL_TIMEOUT = 180.0  # seconds
+BEATOVEN_POLL_INITIAL_DELAY = 1.0
+BEATOVEN_POLL_MAX_DELAY = 8.0
+BEATOVEN_POLL_BACKOFF = 1.5
+BEATOVEN_RETRY_AFTER_MAX = 10.0  # cap on server-provided Retry-After hints
+BEATOVEN_JOB_TIMEOUT = 210.0  # hard bound on poll + download, beyond the polling deadline
+
+# Default-only prompts that just failed on Beatoven go straight to the fallback for a minute
+BEATOVEN_FAILURE_TTL = 60.0  # seconds
+_recent_beatoven_failures: dict[str, float] = {}  # prompt_text -> retry-after (monotonic)
+
+# Cap concurrent Beatoven jobs so bursts queue here instead of tripping upstream rate limits
+_beatoven_slots = asyncio.Semaphore(int(os.getenv("BEATOVEN_MAX_CONCURRENCY", "3")))
+
+# Beatoven credits only change when a track is generated: successful usage lookups are
+# cached briefly per API key and dropped as soon as a Beatoven track completes
+BEATOVEN_USAGE_URL = "https://public-api.beatoven.ai/api/v1/usage"
+_CREDITS_CACHE_TTL = 30.0  # seconds
+_credits_cache: dict[str, tuple[float, int]] = {}  # api_key -> (expires_at, credits)
+
+# Identical beat jobs already running: (user_id, session_id, prompt_text, bpm) -> task.
+# A retry or second tab awaits the running job instead of composing (and paying for) it twice
+_inflight_beats: dict[tuple, asyncio.Task] = {}
+
+# Silent fallback beats are encoded once per length and copied thereafter
+SILENT_BEAT_DIR = MEDIA_DIR / "demo_beats"
+SILENT_BEAT_DURATIONS = (30, 60, 120, 180, 300)  # seconds
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a numeric Retry-After header (capped), or None if absent/unusable"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if not math.isfinite(seconds) or seconds < 0:
+        return None
+    return min(seconds, BEATOVEN_RETRY_AFTER_MAX)
+
+
+async def fetch_beatoven_credits(api_key: str) -> tuple[int, str]:
+    """Return (credits, source) from Beatoven, served from the in-process cache while fresh"""
+    now = time.monotonic()
+    cached = _credits_cache.get(api_key)
+    if cached and cached[0] > now:
+        return cached[1], "beatoven"
+    
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    try:
+        credits_res = await get_http_client().get(BEATOVEN_USAGE_URL, headers=headers, timeout=5)
+        if credits_res.is_success:
+            credits_data = orjson.loads(credits_res.content)
+            credits = credits_data.get("credits", credits_data.get("remaining", 10))
+            _credits_cache[api_key] = (now + _CREDITS_CACHE_TTL, credits)
+            return credits, "beatoven"
+    except (httpx.HTTPError, ValueError):
+        pass
+    return 10, "fallback"
+
+
+def invalidate_credits_cache():
+    """Forget cached Beatoven credits (a generated track has consumed some)"""
+    _credits_cache.clear()
+
+
+def _silent_beat_file(duration_sec: int) -> tuple[Path, int]:
+    """
+    Return (path, length) of a cached silent MP3 covering duration_sec
+    (the longest cached length if duration_sec exceeds it), encoding it on first use.
+    """
+    length = next((d for d in SILENT_BEAT_DURATIONS if d >= duration_sec), SILENT_BEAT_DURATIONS[-1])
+    path = SILENT_BEAT_DIR / f"silent_{length}s.mp3"
+    if not path.exists():
+        SILENT_BEAT_DIR.mkdir(parents=True, exist_ok=True)
+        temp_path = SILENT_BEAT_DIR / f".{path.name}.{uuid.uuid4().hex}.tmp"
+        AudioSegment.silent(duration=length * 1000).export(str(temp_path), format="mp3")
+        os.replace(temp_path, path)
+        logger.info(f"Cached silent beat at {path}")
+    return path, length
+
+
+def warm_silent_beat_library():
+    """Encode any missing silent clips up front so no request pays for an ffmpeg encode"""
+    for length in SILENT_BEAT_DURATIONS:
+        try:
+            _silent_beat_file(length)
+        except Exception as e:
+            logger.warning(f"Could not pre-build {length}s silent beat: {e}")
+            return
+
+
+def _ensure_fallback_beat(media_dir: Path, assets_dir: Path) -> Path:
+    """Make sure the demo fallback beat exists (bundled asset, else silent clip) and return its path"""
+    demo_beats_dir = media_dir / "demo_beats"
+    demo_beats_dir.mkdir(exist_ok=True, parents=True)
+    fallback = demo_beats_dir / "default_beat.mp3"
+    
+    if not fallback.exists():
+        # Try to copy from assets if it exists
+        source_beat = assets_dir / "demo" / "beat.mp3"
+        if source_beat.exists():
+            shutil.copy(source_beat, fallback)
+            logger.info(f"Created fallback beat at {fallback}")
+        else:
+            # Use the cached 60s silent clip as fallback
+            logger.info(f"Creating silent fallback beat at {fallback}")
+            silent_file, _ = _silent_beat_file(60)
+            shutil.copy(silent_file, fallback)
+    return fallback
+
 
 class BeatService:
     """Service class for beat generation business logic"""
     
     def __init__(self):
         self.api_key = os.getenv("BEATOVEN_API_KEY")
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
     
     async def create_beat_track(
         self,
@@ -48,10 +174,8 @@ class BeatService:
         session_path = get_session_media_path(session_id, user_id)
         
         # Log request
-        if duration_sec is not None:
-            logger.info(f"🎵 Beat creation request: prompt={prompt[:50] if prompt else ''}..., mood={mood}, genre={genre}, bpm={bpm or 'AI-determined'}, duration={duration_sec}s, session={session_id}")
-        else:
-            logger.info(f"🎵 Beat creation request: prompt={prompt[:50] if prompt else ''}..., mood={mood}, genre={genre}, bpm={bpm or 'AI-determined'}, duration=AI-determined, session={session_id}")
+        duration_label = f"{duration_sec}s" if duration_sec is not None else "AI-determined"
+        logger.info(f"🎵 Beat creation request: prompt={prompt[:50] if prompt else ''}..., mood={mood}, genre={genre}, bpm={bpm or 'AI-determined'}, duration={duration_label}, session={session_id}")
         
         # Build prompt text
         if prompt:
@@ -67,30 +191,85 @@ class BeatService:
         if duration_sec is not None:
             prompt_text = f"{duration_sec} seconds {prompt_text}"
         
+        job_key = (user_id, session_id, prompt_text, bpm)
+        job = _inflight_beats.get(job_key)
+        if job is not None:
+            logger.info(f"🎵 Joining in-flight beat job for session={session_id}")
+        else:
+            job = asyncio.create_task(self._generate_beat(
+                user_id=user_id,
+                session_id=session_id,
+                session_path=session_path,
+                prompt_text=prompt_text,
+                mood=mood,
+                genre=genre,
+                bpm=bpm,
+                duration_sec=duration_sec,
+                default_prompt=not prompt and mood == "energetic" and genre == "hip-hop"
+            ))
+            _inflight_beats[job_key] = job
+            job.add_done_callback(lambda _: _inflight_beats.pop(job_key, None))
+        
+        # Shield so one caller going away doesn't cancel the job for the others
+        return await asyncio.shield(job)
+    
+    async def _generate_beat(
+        self,
+        user_id: str,
+        session_id: str,
+        session_path: Path,
+        prompt_text: str,
+        mood: str,
+        genre: str,
+        bpm: Optional[int],
+        duration_sec: Optional[int],
+        default_prompt: bool = False
+    ) -> Dict[str, Any]:
+        """Run one beat job: Beatoven compose + poll, falling back to a demo/silent beat"""
+        # Prepare the fallback beat in the background so a Beatoven failure can copy it immediately
+        fallback_ready = asyncio.create_task(asyncio.to_thread(_ensure_fallback_beat, MEDIA_DIR, ASSETS_DIR))
+        
         # Try Beatoven API first if key available
-        if self.api_key:
+        if self.api_key and default_prompt and _recent_beatoven_failures.get(prompt_text, 0.0) > time.monotonic():
+            logger.info("Beatoven failed on this default prompt within the last minute - using fallback beat")
+        elif self.api_key:
             try:
-                # 1. Call Beatoven compose API
-                task_id = await self._call_beatoven_compose(prompt_text)
-                
-                # 2. Poll for status and finalize
-                current_user = {"id": user_id}  # For compatibility with existing code
-                result = await self._poll_beatoven_status(
-                    task_id=task_id,
-                    session_path=session_path,
-                    current_user=current_user,
-                    session_id=session_id,
-                    mood=mood,
-                    genre=genre,
-                    bpm=bpm
-                )
+                async with _beatoven_slots:
+                    # 1. Call Beatoven compose API
+                    task_id = await self._call_beatoven_compose(prompt_text)
+                    
+                    # 2. Poll for status and finalize
+                    current_user = {"id": user_id}  # For compatibility with existing code
+                    result = await asyncio.wait_for(
+                        self._poll_beatoven_status(
+                            task_id=task_id,
+                            session_path=session_path,
+                            current_user=current_user,
+                            session_id=session_id,
+                            mood=mood,
+                            genre=genre,
+                            bpm=bpm
+                        ),
+                        timeout=BEATOVEN_JOB_TIMEOUT
+                    )
                 
                 if result:
+                    # Nobody awaits the prefetch now; retrieve its outcome so errors aren't reported as unhandled
+                    fallback_ready.add_done_callback(lambda task: task.cancelled() or task.exception())
                     return result
+            except asyncio.TimeoutError:
+                logger.warning(f"Beatoven job exceeded {BEATOVEN_JOB_TIMEOUT:.0f}s - falling back to demo beat")
             except httpx.RequestError as e:
                 logger.warning(f"Beatoven API request failed: {e} - falling back to demo beat")
             except Exception as e:
                 logger.warning(f"Beatoven API failed: {e} - falling back to demo beat")
+            
+            if default_prompt:
+                now = time.monotonic()
+                # The key carries the caller's duration, so drop expired prompts instead of letting them pile up
+                for expired in [k for k, retry_at in _recent_beatoven_failures.items() if retry_at <= now]:
+                    del _recent_beatoven_failures[expired]
+                _recent_beatoven_failures[prompt_text] = now + BEATOVEN_FAILURE_TTL
         
         # 3. FALLBACK: Always return a beat (ALWAYS succeeds)
         return await self._handle_fallback_beat(
@@ -100,7 +279,8 @@ class BeatService:
             bpm=bpm,
             mood=mood,
             genre=genre,
-            duration_sec=duration_sec
+            duration_sec=duration_sec,
+            fallback_ready=fallback_ready
         )
     
     async def _call_beatoven_compose(self, prompt_text: str) -> str:
@@ -116,18 +296,12 @@ class BeatService:
         Raises:
             Exception: If the API call fails or returns an error
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {"prompt": {"text": prompt_text}, "format": "mp3", "looping": False}
         
         logger.info(f"🎵 Beatoven job started: {prompt_text}")
         
         compose_url = "https://public-api.beatoven.ai/api/v1/tracks/compose"
-        async with httpx.AsyncClient() as client:
-            compose_res = await client.post(compose_url, headers=headers, json=payload, timeout=30)
+        compose_res = await get_http_client().post(compose_url, headers=self.headers, json=payload, timeout=30)
         
         # Handle HTTP errors gracefully
         if compose_res.status_code == 422:
@@ -142,7 +316,7 @@ class BeatService:
             logger.warning(f"Beatoven API returned {compose_res.status_code}: {error_detail}")
             raise Exception(f"Beatoven API error {compose_res.status_code}: {error_detail}")
         
-        compose_data = compose_res.json()
+        compose_data = orjson.loads(compose_res.content)
         task_id = compose_data.get("task_id")
         
         if not task_id:
@@ -179,99 +353,110 @@ class BeatService:
         Raises:
             Exception: If polling fails, times out, or encounters an error
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         user_id = current_user.get("id", "")
         
-        # Poll for completion (up to 3 minutes)
-        async with httpx.AsyncClient() as client:
-            for attempt in range(60):
-                await asyncio.sleep(3)
-                status_url = f"https://public-api.beatoven.ai/api/v1/tasks/{task_id}"
-                status_res = await client.get(status_url, headers=headers, timeout=30)
+        # Poll for completion (up to 3 minutes), backing off between checks
+        client = get_http_client()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + BEATOVEN_POLL_TIMEOUT
+        delay = BEATOVEN_POLL_INITIAL_DELAY
+        sleep_for = delay
+        polls = 0
+        while True:
+            await asyncio.sleep(sleep_for + random.uniform(0, 0.25))
+            delay = min(delay * BEATOVEN_POLL_BACKOFF, BEATOVEN_POLL_MAX_DELAY)
+            polls += 1
+            status_url = f"https://public-api.beatoven.ai/api/v1/tasks/{task_id}"
+            status_res = await client.get(status_url, headers=self.headers, timeout=30)
+            
+            if not status_res.is_success:
+                logger.warning(f"Beatoven status check failed: {status_res.status_code}")
+                raise Exception(f"Beatoven status check error: {status_res.status_code}")
+            
+            status_data = orjson.loads(status_res.content)
+            status = status_data.get("status")
+            
+            if status == "composed":
+                meta = status_data.get("meta", {})
+                audio_url = meta.get("track_url")
+                if not audio_url:
+                    raise Exception("Beatoven: track_url missing")
                 
-                if not status_res.is_success:
-                    logger.warning(f"Beatoven status check failed: {status_res.status_code}")
-                    raise Exception(f"Beatoven status check error: {status_res.status_code}")
+                # Stream the audio to disk so only one chunk is held in memory
+                output_file = session_path / "beat.mp3"
+                async with client.stream("GET", audio_url, timeout=60) as audio_res:
+                    audio_res.raise_for_status()
+                    async with aiofiles.open(output_file, "wb") as f:
+                        async for chunk in audio_res.aiter_bytes(65536):
+                            await f.write(chunk)
                 
-                status_data = status_res.json()
-                status = status_data.get("status")
+                logger.info(f"🎵 Beatoven track ready: {output_file}")
+                invalidate_credits_cache()
                 
-                if status == "composed":
-                    meta = status_data.get("meta", {})
-                    audio_url = meta.get("track_url")
-                    if not audio_url:
-                        raise Exception("Beatoven: track_url missing")
-                    
-                    # Download the audio
-                    output_file = session_path / "beat.mp3"
-                    audio_data = await client.get(audio_url, timeout=60)
-                    audio_data.raise_for_status()
-                    with open(output_file, "wb") as f:
-                        f.write(audio_data.content)
-                    
-                    logger.info(f"🎵 Beatoven track ready: {output_file}")
-                    
-                    # Extract metadata from Beatoven response
-                    extracted_metadata = {}
-                    if meta.get("duration"):
-                        extracted_metadata["duration"] = int(meta.get("duration"))
-                    elif meta.get("length"):
-                        extracted_metadata["duration"] = int(meta.get("length"))
-                    
-                    # BPM from meta or use provided/calculated bpm
-                    extracted_bpm = meta.get("bpm") or meta.get("tempo") or bpm
-                    if extracted_bpm:
-                        extracted_metadata["bpm"] = int(extracted_bpm) if isinstance(extracted_bpm, (int, float)) else extracted_bpm
-                    
-                    # Key from meta
-                    if meta.get("key"):
-                        extracted_metadata["key"] = meta.get("key")
-                    
-                    # Update project memory
-                    memory = await get_or_create_project_memory(session_id, MEDIA_DIR)
+                # Extract metadata from Beatoven response
+                extracted_metadata = {}
+                if meta.get("duration"):
+                    extracted_metadata["duration"] = int(meta.get("duration"))
+                elif meta.get("length"):
+                    extracted_metadata["duration"] = int(meta.get("length"))
+                
+                # BPM from meta or use provided/calculated bpm
+                extracted_bpm = meta.get("bpm") or meta.get("tempo") or bpm
+                if extracted_bpm:
+                    extracted_metadata["bpm"] = int(extracted_bpm) if isinstance(extracted_bpm, (int, float)) else extracted_bpm
+                
+                # Key from meta
+                if meta.get("key"):
+                    extracted_metadata["key"] = meta.get("key")
+                
+                # Update project memory
+                memory = await get_or_create_project_memory(session_id, MEDIA_DIR)
+                async with memory.transaction():
                     await memory.update_metadata(tempo=extracted_bpm, mood=mood, genre=genre)
                     await memory.add_asset("beat", f"/media/{user_id}/{session_id}/beat.mp3", {"bpm": extracted_bpm, "mood": mood, "metadata": extracted_metadata})
                     await memory.advance_stage("beat", "lyrics")
-                    
-                    # Prepare beat_url and beat_meta for orchestrator
-                    beat_url = f"/media/{user_id}/{session_id}/beat.mp3"
-                    beat_meta = {
-                        "bpm": extracted_bpm,
-                        "mood": mood,
-                        "genre": genre,
-                        "provider": "beatoven",
-                        **extracted_metadata
-                    }
-                    
-                    # Auto-save to orchestrator
-                    orchestrator = ProjectOrchestrator(user_id, session_id)
-                    orchestrator.update_stage("beat", {
-                        "url": beat_url,
-                        "meta": beat_meta,
-                        "completed": True
-                    })
-                    
-                    log_endpoint_event("/beats/create", session_id, "success", {"source": "beatoven", "mood": mood})
-                    
-                    return {
-                        "session_id": session_id,
-                        "beat_url": beat_url,
-                        "url": beat_url,
-                        "status": "ready",
-                        "provider": "beatoven",
-                        "progress": 100
-                    }
                 
-                elif status in ("composing", "running", "queued"):
-                    logger.info(f"⏳ Beatoven status: {status} ({attempt+1}/60)")
-                    continue
-                else:
-                    raise Exception(f"Unexpected Beatoven status: {status}")
+                # Prepare beat_url and beat_meta for orchestrator
+                beat_url = f"/media/{user_id}/{session_id}/beat.mp3"
+                beat_meta = {
+                    "bpm": extracted_bpm,
+                    "mood": mood,
+                    "genre": genre,
+                    "provider": "beatoven",
+                    **extracted_metadata
+                }
+                
+                # Auto-save to orchestrator
+                orchestrator = ProjectOrchestrator(user_id, session_id)
+                orchestrator.update_stage("beat", {
+                    "url": beat_url,
+                    "meta": beat_meta,
+                    "completed": True
+                })
+                
+                log_endpoint_event("/beats/create", session_id, "success", {"source": "beatoven", "mood": mood})
+                
+                return {
+                    "session_id": session_id,
+                    "beat_url": beat_url,
+                    "url": beat_url,
+                    "status": "ready",
+                    "provider": "beatoven",
+                    "progress": 100
+                }
+            
+            elif status in ("composing", "running", "queued"):
+                logger.info(f"⏳ Beatoven status: {status} (poll {polls})")
+                if loop.time() > deadline:
+                    break
+                # Honor the server's Retry-After hint when given, else keep backing off
+                retry_after = _parse_retry_after(status_res.headers.get("Retry-After"))
+                sleep_for = retry_after if retry_after is not None else delay
+                continue
+            else:
+                raise Exception(f"Unexpected Beatoven status: {status}")
         
+        logger.warning(f"Beatoven task {task_id} still pending after {polls} polls")
         raise Exception("Beatoven generation timed out (3 minutes)")
     
     async def _handle_fallback_beat(
@@ -282,40 +467,30 @@ class BeatService:
         bpm: Optional[int],
         mood: str,
         genre: str,
-        duration_sec: Optional[int]
+        duration_sec: Optional[int],
+        fallback_ready: Optional[asyncio.Task] = None
     ) -> Dict[str, Any]:
-        """Create fallback beat (demo or silent)"""
+        """Create fallback beat (demo or silent), reusing a prefetch task when one was started"""
+        memory = None
         try:
-            # Ensure demo_beats directory exists
-            demo_beats_dir = MEDIA_DIR / "demo_beats"
-            demo_beats_dir.mkdir(exist_ok=True, parents=True)
-            fallback = demo_beats_dir / "default_beat.mp3"
-            
-            # Check if fallback exists, if not create it
-            if not fallback.exists():
-                # Try to copy from assets if it exists
-                source_beat = ASSETS_DIR / "demo" / "beat.mp3"
-                if source_beat.exists():
-                    shutil.copy(source_beat, fallback)
-                    logger.info(f"Created fallback beat at {fallback}")
-                else:
-                    # Create silent audio clip as fallback
-                    logger.info(f"Creating silent fallback beat at {fallback}")
-                    silent_audio = AudioSegment.silent(duration=60000)  # 60 seconds
-                    silent_audio.export(str(fallback), format="mp3")
+            if fallback_ready is not None:
+                fallback = await fallback_ready
+            else:
+                fallback = await asyncio.to_thread(_ensure_fallback_beat, MEDIA_DIR, ASSETS_DIR)
             
             # Copy fallback to session
             output_file = session_path / "beat.mp3"
-            shutil.copy(fallback, output_file)
+            await asyncio.to_thread(shutil.copy, fallback, output_file)
             
             logger.info(f"⚠️ Beatoven unavailable, using fallback demo beat")
             
             # Update project memory
             memory = await get_or_create_project_memory(session_id, MEDIA_DIR)
             demo_metadata = {"duration": 60, "bpm": bpm or 120, "key": "C"}
-            await memory.update_metadata(tempo=bpm or 120, mood=mood, genre=genre)
-            await memory.add_asset("beat", f"/media/{user_id}/{session_id}/beat.mp3", {"bpm": bpm or 120, "mood": mood, "source": "demo", "metadata": demo_metadata})
-            await memory.advance_stage("beat", "lyrics")
+            async with memory.transaction():
+                await memory.update_metadata(tempo=bpm or 120, mood=mood, genre=genre)
+                await memory.add_asset("beat", f"/media/{user_id}/{session_id}/beat.mp3", {"bpm": bpm or 120, "mood": mood, "source": "demo", "metadata": demo_metadata})
+                await memory.advance_stage("beat", "lyrics")
             
             # Prepare beat_url and beat_meta for orchestrator
             beat_url = f"/media/{user_id}/{session_id}/beat.mp3"
@@ -351,13 +526,15 @@ class BeatService:
             logger.error(f"Fallback beat creation failed: {e} - creating silent audio in session")
             try:
                 output_file = session_path / "beat.mp3"
-                silent_audio = AudioSegment.silent(duration=(duration_sec or 60) * 1000)
-                silent_audio.export(str(output_file), format="mp3")
+                silent_file, silent_length = await asyncio.to_thread(_silent_beat_file, duration_sec or 60)
+                await asyncio.to_thread(shutil.copy, silent_file, output_file)
                 
-                memory = await get_or_create_project_memory(session_id, MEDIA_DIR)
-                silent_metadata = {"duration": duration_sec or 60, "bpm": bpm or 120, "key": "C"}
-                await memory.update_metadata(tempo=bpm or 120, mood=mood, genre=genre)
-                await memory.add_asset("beat", f"/media/{user_id}/{session_id}/beat.mp3", {"bpm": bpm or 120, "mood": mood, "source": "silent_fallback", "metadata": silent_metadata})
+                if memory is None:
+                    memory = await get_or_create_project_memory(session_id, MEDIA_DIR)
+                silent_metadata = {"duration": silent_length, "bpm": bpm or 120, "key": "C"}
+                async with memory.transaction():
+                    await memory.update_metadata(tempo=bpm or 120, mood=mood, genre=genre)
+                    await memory.add_asset("beat", f"/media/{user_id}/{session_id}/beat.mp3", {"bpm": bpm or 120, "mood": mood, "source": "silent_fallback", "metadata": silent_metadata})
                 
                 # Auto-save to orchestrator
                 try:
@@ -405,22 +582,10 @@ class BeatService:
             return {"credits": 10, "source": "default"}
         
         try:
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            credits_url = "https://public-api.beatoven.ai/api/v1/usage"
-            try:
-                import requests
-                credits_res = requests.get(credits_url, headers=headers, timeout=10)
-                if credits_res.ok:
-                    credits_data = credits_res.json()
-                    credits = credits_data.get("credits", credits_data.get("remaining", 10))
-                    log_endpoint_event("/beats/credits", None, "success", {"credits": credits, "source": "beatoven"})
-                    return {"credits": credits, "source": "beatoven"}
-            except:
-                pass
+            credits, source = await fetch_beatoven_credits(api_key)
+            if source == "beatoven":
+                log_endpoint_event("/beats/credits", None, "success", {"credits": credits, "source": "beatoven"})
+                return {"credits": credits, "source": "beatoven"}
             
             # Fallback: return default credits
             logger.warning("Beatoven credits API not available – using fallback default")
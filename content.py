@@ -358,8 +358,9 @@ async def schedule_video(request: ScheduleRequest):
             if result.get("success"):
                 # Update project memory
                 memory = await get_or_create_project_memory(session_id, Path("./media"))
-                await memory.update("contentScheduled", True)
-                await memory.advance_stage("content", "analytics")
+                async with memory.transaction():
+                    await memory.update("contentScheduled", True)
+                    await memory.advance_stage("content", "analytics")
                 
                 return success_response(
                     data={
@@ -408,8 +409,9 @@ async def schedule_video(request: ScheduleRequest):
         
         # Update project memory
         memory = await get_or_create_project_memory(session_id, Path("./media"))
-        await memory.update("contentScheduled", True)
-        await memory.advance_stage("content", "analytics")
+        async with memory.transaction():
+            await memory.update("contentScheduled", True)
+            await memory.advance_stage("content", "analytics")
         
         return success_response(
             data={
@@ -3,28 +3,33 @@ Shared utility functions for routers and services
 """
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4096)
+def _ensure_session_dir(path: Path) -> Path:
+    """mkdir a session directory once per process; later calls skip the syscall"""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
 def get_session_media_path(session_id: str, user_id: str) -> Path:
     """
     Phase 8B:
     User-scoped media path. No backward compatibility.
     """
-    path = Path("./media") / user_id / session_id
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return _ensure_session_dir(Path("./media") / user_id / session_id)
 
-def log_endpoint_event(endpoint: str, session_id: Optional[str] = None, result: str = "success", details: Optional[dict] = None):
-    """Log endpoint execution to app.log"""
+def log_endpoint_event(endpoint: str, session_id: Optional[str] = None, result: str = "success", details: Optional[dict] = None, now_iso: Optional[str] = None):
+    """Log endpoint execution to app.log (pass now_iso to reuse a timestamp the caller already computed)"""
     log_data = {
         "endpoint": endpoint,
         "session_id": session_id or "none",
         "result": result,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso or datetime.now(timezone.utc).isoformat()
     }
     if details:
         log_data.update(details)
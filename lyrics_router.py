@@ -2,13 +2,14 @@
 Lyrics Router - API endpoints for lyrics generation
 """
 import uuid
-from fastapi import APIRouter, File, UploadFile, Form, Body, Depends
+import aiofiles
+from fastapi import APIRouter, File, UploadFile, Form, Depends
 from typing import Optional, List
 from pydantic import BaseModel, Field
 from pathlib import Path
 
 from auth import get_current_user
-from services.lyrics_service import LyricsService
+from services.lyrics_service import LyricsService, parse_song_sections
 from backend.utils.responses import success_response, error_response
 from utils.helpers import log_endpoint_event
 
@@ -37,10 +38,28 @@ class LyricRefineRequest(BaseModel):
     history: Optional[List[dict]] = Field(default=[], description="V18.1: Recent conversation history (last 3 interactions)")
     structured_lyrics: Optional[dict] = Field(default=None, description="V18.1: Structured lyrics object with sections")
     rhythm_map: Optional[dict] = Field(default=None, description="V18.1: Rhythm approximation map per section")
+    defer: bool = Field(default=False, description="Queue through the OpenAI Batch API (cheaper, not immediate); poll /lyrics/refine/status/{job_id}")
 
 # Service instance
 lyrics_service = LyricsService()
 
+# Refine instructions that ask for no change; answered without an LLM round-trip
+NOOP_REFINE_INSTRUCTIONS = frozenset({"no change", "no changes", "keep", "keep it", "nothing", "none"})
+
+# Uploaded beats are streamed to disk in chunks and refused past this size
+MAX_BEAT_UPLOAD_BYTES = 50 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+def _beat_too_large_response(session_id: str):
+    log_endpoint_event("/lyrics/from_beat", session_id, "error", {"error": "file_too_large"})
+    return error_response(
+        "file_too_large",
+        413,
+        f"Beat file exceeds the {MAX_BEAT_UPLOAD_BYTES // (1024 * 1024)} MB limit",
+        data={"session_id": session_id}
+    )
+
 
 @lyrics_router.post("/songs/write")
 async def write_song(
@@ -69,31 +88,7 @@ async def write_song(
             try:
                 # Parse lyrics to get first verse
                 lyrics_text = result.get("lyrics", "")
-                lyrics_lines = lyrics_text.split('\n')
-                parsed_lyrics = {"verse": "", "chorus": "", "bridge": ""}
-                current_section = None
-                
-                for line in lyrics_lines:
-                    line_lower = line.lower().strip()
-                    if '[verse' in line_lower or line_lower.startswith('verse'):
-                        current_section = "verse"
-                        continue
-                    elif '[chorus' in line_lower or line_lower.startswith('chorus'):
-                        current_section = "chorus"
-                        continue
-                    elif '[bridge' in line_lower or line_lower.startswith('bridge'):
-                        current_section = "bridge"
-                        continue
-                    
-                    if current_section and line.strip():
-                        if parsed_lyrics[current_section]:
-                            parsed_lyrics[current_section] += "\n" + line.strip()
-                        else:
-                            parsed_lyrics[current_section] = line.strip()
-                
-                # If no sections found, treat all as verse
-                if not any(parsed_lyrics.values()):
-                    parsed_lyrics["verse"] = lyrics_text
+                parsed_lyrics = parse_song_sections(lyrics_text)
                 
                 # Use first verse or first 200 chars for voice generation
                 voice_text = parsed_lyrics.get("verse", "").split('\n')[0] if parsed_lyrics.get("verse") else (lyrics_text.split('\n')[0] if lyrics_text else "Here are your lyrics")
@@ -101,7 +96,7 @@ async def write_song(
                     voice_text = voice_text[:200] + "..."
                 
                 # Generate voice using default persona "nova"
-                voice_result = gtts_speak("nova", voice_text, session_id, current_user["user_id"])
+                voice_result = await gtts_speak("nova", voice_text, session_id, current_user["user_id"])
                 if isinstance(voice_result, dict) and voice_result.get("ok"):
                     voice_url = voice_result.get("data", {}).get("url")
                     import logging
@@ -109,6 +104,9 @@ async def write_song(
             except Exception as e:
                 import logging
                 logging.getLogger(__name__).warning(f"Voice generation for lyrics failed: {e}")
+        except ImportError as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Voice generation unavailable for lyrics: {e}")
         
         log_endpoint_event("/songs/write", session_id, "success", {"voice_generated": voice_url is not None})
         return success_response(
@@ -135,12 +133,22 @@ async def generate_lyrics_from_beat(
     session_path = Path("./media") / current_user["user_id"] / session_id
     session_path.mkdir(parents=True, exist_ok=True)
     
+    if file.size is not None and file.size > MAX_BEAT_UPLOAD_BYTES:
+        return _beat_too_large_response(session_id)
+    
     try:
-        # Save uploaded file temporarily
+        # Save uploaded file temporarily, streaming so memory stays bounded by one chunk
         temp_file = session_path / f"temp_beat_{uuid.uuid4().hex[:8]}.mp3"
-        content = await file.read()
-        with open(temp_file, 'wb') as f:
-            f.write(content)
+        total_bytes = 0
+        async with aiofiles.open(temp_file, 'wb') as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                total_bytes += len(chunk)
+                if total_bytes > MAX_BEAT_UPLOAD_BYTES:
+                    break
+                await f.write(chunk)
+        if total_bytes > MAX_BEAT_UPLOAD_BYTES:
+            temp_file.unlink(missing_ok=True)
+            return _beat_too_large_response(session_id)
         
         result = await lyrics_service.generate_lyrics_from_beat(
             user_id=current_user["user_id"],
@@ -188,6 +196,26 @@ async def generate_free_lyrics(request: FreeLyricsRequest):
 @lyrics_router.post("/lyrics/refine")
 async def refine_lyrics(request: LyricRefineRequest):
     """V18.1: Refine, rewrite, or extend lyrics based on user instructions with structured parsing and history"""
+    instruction = request.instruction.strip().lower().rstrip(".!")
+    if not instruction or instruction in NOOP_REFINE_INSTRUCTIONS:
+        return success_response(
+            data={"lyrics": request.lyrics},
+            message="No-op instruction"
+        )
+    
+    if request.defer:
+        result = await lyrics_service.submit_refine_batch(
+            lyrics=request.lyrics,
+            instruction=request.instruction,
+            bpm=request.bpm,
+            history=request.history,
+            structured_lyrics=request.structured_lyrics,
+            rhythm_map=request.rhythm_map
+        )
+        if result is None:
+            return error_response("openai_not_configured", 503, "Deferred refinement requires OpenAI")
+        return success_response(data=result, message="Lyrics refinement queued", status=202)
+    
     try:
         result = await lyrics_service.refine_lyrics(
             lyrics=request.lyrics,
@@ -209,3 +237,16 @@ async def refine_lyrics(request: LyricRefineRequest):
             data={}
         )
 
+
+@lyrics_router.get("/lyrics/refine/status/{job_id}")
+async def get_refine_status(job_id: str):
+    """Status (and, once finished, the lyrics) of a deferred /lyrics/refine job"""
+    try:
+        job = await lyrics_service.get_refine_batch_status(job_id)
+    except Exception as e:
+        log_endpoint_event("/lyrics/refine/status", None, "error", {"error": str(e), "job_id": job_id})
+        return error_response("batch_status_failed", 502, "Failed to check refinement status", data={"job_id": job_id})
+    if job is None:
+        return error_response("job_not_found", 404, f"Refine job {job_id} not found")
+    return success_response(data=job, message=f"Refine job {job['status']}")
+
@@ -3,14 +3,17 @@ Lyrics Service - Business logic for lyrics generation
 """
 import os
 import uuid
-import json
 import re
+import asyncio
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 
-from openai import OpenAI
+import aiofiles
+import orjson
+from openai import AsyncOpenAI
 from project_memory import get_or_create_project_memory
 from backend.orchestrator import ProjectOrchestrator
 from utils.helpers import get_session_media_path, log_endpoint_event
@@ -20,6 +23,250 @@ logger = logging.getLogger(__name__)
 # Constants
 MEDIA_DIR = Path("./media")
 
+# One AsyncOpenAI client per process: completions are awaited instead of blocking
+# the event loop, and its HTTPS connection pool is reused across requests
+@lru_cache(maxsize=1)
+def _openai_client() -> Optional[AsyncOpenAI]:
+    """Shared AsyncOpenAI client, built on first use; None when OPENAI_API_KEY is unset"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    return AsyncOpenAI(api_key=api_key) if api_key else None
+
+
+# Prompt text and fallback lyrics are fixed strings; build them once at import
+_NP22_BASE_PROMPT = """Write lyrics in the NP22 sound: a cinematic fusion of soulful rock and modern trap — dark-purple energy, emotional intensity, motivational tone, stadium-level delivery. Focus on clean rhythm, expressive soul, mindset themes. Structure: Hook + Verse 1 + Optional Pre-Hook. Keep flow tight, melodic, empowering."""
+
+_NP22_SYSTEM_PROMPT = "You are a professional songwriter specializing in NP22-style lyrics: cinematic fusion of soulful rock and modern trap with dark-purple energy, emotional intensity, and motivational tone."
+
+_NP22_FALLBACK = """[Hook]
+Rising up from the darkness, I'm taking control
+Every step forward, I'm reaching my goal
+This is my moment, this is my time
+Nothing can stop me, I'm in my prime
+
+[Verse 1]
+Through the struggle and the pain
+I found my strength again
+No more hiding in the shadows
+I'm breaking free from all the chains
+Standing tall, I claim my name"""
+
+_SONG_SYSTEM_PROMPT = "You are a professional songwriter. Write authentic, emotionally resonant lyrics."
+
+# Byte-identical on every /lyrics/refine call so the provider can cache the prefix;
+# everything request-specific (BPM, structure, history, instruction) goes in the user message
+_REFINE_SYSTEM_PROMPT = """You are an NP22-style lyric collaborator. Rewrite lyrics based on instruction while keeping:
+- NP22 style (cinematic soulful rock × modern trap)
+- dark-purple energy
+- mindset themes
+- melodic flow
+- stadium-level emotion
+
+Only modify what the instruction asks for. Keep original structure unless instruction says otherwise.
+
+Rewrite the lyrics according to the instruction while maintaining NP22 style. Return only the revised lyrics as plain text (no JSON, no explanations)."""
+
+# Filled in with genre/mood only when the fallback is actually used
+_SONG_FALLBACK_TEMPLATE = """[Verse 1]
+This is a {genre} verse about {mood}
+Flowing through the rhythm and the beat
+Every word connects with your soul
+This is how we make it complete
+
+[Chorus]
+{mood_title} vibes all around
+{genre} is the sound we found
+Let the music take control
+Feel it deep within your soul
+
+[Verse 2]
+Building on the energy we share
+Taking it higher everywhere
+This is more than just a song
+This is where we all belong"""
+
+# Section headers such as "[Verse 1]", "Chorus:", "[Bridge]" or "**[Verse 1]**":
+# a bracketed tag anywhere in the line, or a line starting with the section name
+_SECTION_RE = re.compile(r'\[(verse|chorus|bridge)|^\s*(verse|chorus|bridge)', re.IGNORECASE)
+
+# Bracketed headers for parse_lyrics_to_structured: [Hook], [Verse 2], [Pre-Chorus], ...
+_HEADER_KEYS = {
+    "hook": "hook",
+    "chorus": "chorus",
+    "bridge": "bridge",
+    "intro": "intro",
+    "outro": "outro",
+    "pre-chorus": "prechorus",
+}
+
+
+def _header_key(line: str) -> Optional[str]:
+    """Sections key for a header line ("[Verse 2]" -> "verse2"), or None for a lyric line"""
+    if line[:1] != '[':
+        return None
+    end = line.find(']', 1)
+    if end == -1:
+        return None
+    tag = line[1:end].lower()
+    key = _HEADER_KEYS.get(tag)
+    if key is not None:
+        return key
+    if tag.startswith('verse'):
+        number = tag[5:].lstrip()
+        if not number:
+            return "verse"
+        if number.isdecimal():
+            return f"verse{number}"
+    return None
+
+
+def parse_song_sections(lyrics_text: str) -> Dict[str, str]:
+    """Split lyrics into verse/chorus/bridge text; everything is treated as verse if no headers are found"""
+    sections = {"verse": [], "chorus": [], "bridge": []}
+    current_section = None
+    for line in lyrics_text.splitlines():
+        section_match = _SECTION_RE.search(line)
+        if section_match:
+            current_section = (section_match.group(1) or section_match.group(2)).lower()
+            continue
+        if current_section and line.strip():
+            sections[current_section].append(line.strip())
+    
+    parsed_lyrics = {name: "\n".join(lines) for name, lines in sections.items()}
+    if not any(parsed_lyrics.values()):
+        parsed_lyrics["verse"] = lyrics_text
+    return parsed_lyrics
+
+
+def _detect_bpm(filepath: str) -> int:
+    """Tempo of an audio file from the median beat interval"""
+    import numpy
+    from aubio import tempo, source
+    hop_size = 1024
+    s = source(filepath, 0, hop_size)  # samplerate=0 keeps the file's own rate
+    o = tempo("default", hop_size * 2, hop_size, s.samplerate)
+    beats = []
+    while True:
+        samples, read = s()
+        if o(samples):
+            beats.append(o.get_last_s())
+        if read < hop_size:
+            break
+    if len(beats) > 1:
+        return int(60.0 / float(numpy.median(numpy.diff(beats))))
+    return 140
+
+
+# Deferred /lyrics/refine requests go through the OpenAI Batch API: a background worker
+# gathers whatever arrives within a short window into one JSONL batch file
+REFINE_BATCH_WINDOW = 2.0  # seconds
+REFINE_BATCH_MAX = 100
+_REFINE_JOBS_MAX = 4096
+_REFINE_TERMINAL = ("completed", "failed")
+_REFINE_JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+# Batches run for up to 24h, so every job record is also kept on disk and survives restarts/deploys
+REFINE_JOBS_DIR = MEDIA_DIR / "_refine_jobs"
+_refine_batch_queue: asyncio.Queue = asyncio.Queue()
+_refine_batch_worker: Optional[asyncio.Task] = None
+_refine_jobs: Dict[str, Dict[str, Any]] = {}  # job_id -> status record, oldest first (in-memory cache of REFINE_JOBS_DIR)
+
+
+def _write_refine_jobs(jobs: List[Dict[str, Any]]):
+    """Persist job records, each through a uniquely named temp file and os.replace"""
+    REFINE_JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    for job in jobs:
+        path = REFINE_JOBS_DIR / f"{job['job_id']}.json"
+        temp_path = path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+        temp_path.write_bytes(orjson.dumps(job))
+        os.replace(temp_path, path)
+
+
+def _read_refine_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Job record from disk, or None if there is none"""
+    try:
+        return orjson.loads((REFINE_JOBS_DIR / f"{job_id}.json").read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def _cache_refine_job(job: Dict[str, Any]):
+    """Keep a record in memory; past the cap, only finished jobs are dropped (they stay on disk)"""
+    _refine_jobs[job["job_id"]] = job
+    excess = len(_refine_jobs) - _REFINE_JOBS_MAX
+    if excess > 0:
+        finished = [job_id for job_id, record in _refine_jobs.items() if record["status"] in _REFINE_TERMINAL]
+        for job_id in finished[:excess]:
+            del _refine_jobs[job_id]
+
+
+async def _load_refine_job(job_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Job record from memory, falling back to disk (e.g. after a restart)"""
+    job = _refine_jobs.get(job_id)
+    if job is not None or not job_id or not _REFINE_JOB_ID_RE.fullmatch(job_id):
+        return job
+    job = await asyncio.to_thread(_read_refine_job, job_id)
+    if job is None:
+        return None
+    if job["status"] == "queued":
+        # Queued by a previous process that stopped before submitting it; that queue is gone
+        job.update(status="failed", error="Service restarted before the job was submitted")
+        await asyncio.to_thread(_write_refine_jobs, [job])
+    _cache_refine_job(job)
+    return job
+
+
+async def _submit_refine_batch(jobs: List[tuple]):
+    """Upload one JSONL file for the gathered jobs and create a Batch API job for it"""
+    client = _openai_client()
+    lines = [
+        orjson.dumps({
+            "custom_id": job_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": "gpt-4o-mini", "messages": messages, "temperature": 0.9}
+        })
+        for job_id, messages in jobs
+    ]
+    batch_file = await client.files.create(file=("refine_batch.jsonl", b"\n".join(lines)), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return batch.id
+
+
+async def _run_refine_batches():
+    """Drain the deferred-refine queue, submitting one batch per gathering window"""
+    loop = asyncio.get_running_loop()
+    while True:
+        jobs = [await _refine_batch_queue.get()]
+        deadline = loop.time() + REFINE_BATCH_WINDOW
+        while len(jobs) < REFINE_BATCH_MAX:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(await asyncio.wait_for(_refine_batch_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        try:
+            batch_id = await _submit_refine_batch(jobs)
+            status, error = "submitted", None
+            logger.info(f"Submitted refine batch {batch_id} with {len(jobs)} request(s)")
+        except Exception as e:
+            batch_id, status, error = None, "failed", str(e)
+            logger.warning(f"Refine batch submission failed: {e}")
+        updated = []
+        for job_id, _ in jobs:
+            if job_id in _refine_jobs:
+                _refine_jobs[job_id].update(status=status, batch_id=batch_id, error=error)
+                updated.append(_refine_jobs[job_id])
+        try:
+            await asyncio.to_thread(_write_refine_jobs, updated)
+        except OSError as e:
+            logger.error(f"Failed to persist refine jobs for batch {batch_id}: {e}")
+
 
 class LyricsService:
     """Service class for lyrics generation business logic"""
@@ -30,21 +277,7 @@ class LyricsService:
     def detect_bpm(self, filepath: Path) -> int:
         """Detect BPM from audio file using aubio"""
         try:
-            from aubio import tempo, source
-            s = source(str(filepath))
-            o = tempo()
-            beats = []
-            while True:
-                samples, read = s()
-                is_beat = o(samples)
-                if is_beat:
-                    beats.append(o.get_last_s())
-                if read < s.hop_size:
-                    break
-            if len(beats) > 1:
-                bpms = 60.0 / (beats[1] - beats[0])
-                return int(bpms)
-            return 140
+            return _detect_bpm(str(filepath))
         except Exception as e:
             logger.warning(f"BPM detection failed: {e} - using default 140")
             return 140
@@ -55,62 +288,42 @@ class LyricsService:
         # In a full implementation, this could analyze spectral features, energy, etc.
         return "dark cinematic emotional"
     
-    def generate_np22_lyrics(
+    async def generate_np22_lyrics(
         self,
         theme: Optional[str] = None,
         bpm: Optional[int] = None,
         mood: Optional[str] = None
     ) -> str:
         """Generate NP22-style lyrics using OpenAI with the specified template"""
-        # Build prompt based on NP22 template
-        base_prompt = """Write lyrics in the NP22 sound: a cinematic fusion of soulful rock and modern trap — dark-purple energy, emotional intensity, motivational tone, stadium-level delivery. Focus on clean rhythm, expressive soul, mindset themes. Structure: Hook + Verse 1 + Optional Pre-Hook. Keep flow tight, melodic, empowering."""
+        client = _openai_client()
+        if client is None:
+            logger.warning("OpenAI API key not configured - using fallback lyrics")
+            return _NP22_FALLBACK
         
+        # Build prompt based on NP22 template
+        parts = [_NP22_BASE_PROMPT]
         if bpm:
-            base_prompt += f"\n\nMatch the BPM: {bpm} - ensure the lyrics flow naturally with this tempo."
-        
+            parts.append(f"\n\nMatch the BPM: {bpm} - ensure the lyrics flow naturally with this tempo.")
         if mood:
-            base_prompt += f"\n\nMood/Energy: {mood}"
-        
-        if theme:
-            base_prompt += f"\n\nTheme: {theme}"
-        else:
-            base_prompt += "\n\nTheme: general motivational mindset"
-        
-        # Fallback lyrics
-        fallback_lyrics = """[Hook]
-Rising up from the darkness, I'm taking control
-Every step forward, I'm reaching my goal
-This is my moment, this is my time
-Nothing can stop me, I'm in my prime
-
-[Verse 1]
-Through the struggle and the pain
-I found my strength again
-No more hiding in the shadows
-I'm breaking free from all the chains
-Standing tall, I claim my name"""
-        
-        if not self.api_key:
-            logger.warning("OpenAI API key not configured - using fallback lyrics")
-            return fallback_lyrics
+            parts.append(f"\n\nMood/Energy: {mood}")
+        parts.append(f"\n\nTheme: {theme}" if theme else "\n\nTheme: general motivational mindset")
+        base_prompt = "".join(parts)
         
         try:
-            client = OpenAI(api_key=self.api_key)
-            
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": "You are a professional songwriter specializing in NP22-style lyrics: cinematic fusion of soulful rock and modern trap with dark-purple energy, emotional intensity, and motivational tone."},
+                    {"role": "system", "content": _NP22_SYSTEM_PROMPT},
                     {"role": "user", "content": base_prompt}
                 ],
                 temperature=0.9
             )
             
-            lyrics_text = response.choices[0].message.content.strip() if response.choices[0].message.content else fallback_lyrics
+            lyrics_text = response.choices[0].message.content.strip() if response.choices[0].message.content else _NP22_FALLBACK
             return lyrics_text
         except Exception as e:
             logger.warning(f"OpenAI lyrics generation failed: {e} - using fallback")
-            return fallback_lyrics
+            return _NP22_FALLBACK
     
     def parse_lyrics_to_structured(self, lyrics_text: str) -> Optional[Dict[str, str]]:
         """Parse lyrics text into structured sections based on headers like [Hook], [Verse 1], etc."""
@@ -118,43 +331,24 @@ Standing tall, I claim my name"""
             return None
         
         sections = {}
-        lines = lyrics_text.split('\n')
-        current_section = None
+        current_key = None
         current_lines = []
         
-        for line in lines:
+        def _flush():
+            if current_key and current_lines:
+                sections[current_key] = '\n'.join(current_lines)
+        
+        # splitlines() also drops the '\r' of CRLF input, so stored lines need no further cleanup
+        for line in lyrics_text.splitlines():
             # Detect section headers: [Hook], [Chorus], [Verse 1], [Verse], [Bridge], etc.
-            section_match = re.match(r'^\[(Hook|Chorus|Verse\s*\d*|Bridge|Intro|Outro|Pre-Chorus)\](.*)$', line, re.IGNORECASE)
-            
-            if section_match:
-                # Save previous section
-                if current_section and current_lines:
-                    section_key = current_section.lower().replace(' ', '').replace('-', '')
-                    # Handle verse numbers
-                    if 'verse' in section_key:
-                        num_match = re.search(r'\d+', current_section)
-                        if num_match:
-                            section_key = f"verse{num_match.group()}"
-                        else:
-                            section_key = "verse"
-                    sections[section_key] = '\n'.join([l for l in current_lines if l.strip()])
-                
-                # Start new section
-                current_section = section_match.group(1)
+            header_key = _header_key(line)
+            if header_key is not None:
+                _flush()
+                current_key = header_key
                 current_lines = []
             elif line.strip():
                 current_lines.append(line)
-        
-        # Save last section
-        if current_section and current_lines:
-            section_key = current_section.lower().replace(' ', '').replace('-', '')
-            if 'verse' in section_key:
-                num_match = re.search(r'\d+', current_section)
-                if num_match:
-                    section_key = f"verse{num_match.group()}"
-                else:
-                    section_key = "verse"
-            sections[section_key] = '\n'.join([l for l in current_lines if l.strip()])
+        _flush()
         
         return sections if sections else None
     
@@ -175,33 +369,13 @@ Standing tall, I claim my name"""
         """
         session_path = get_session_media_path(session_id, user_id)
         
-        # Static fallback lyrics
-        fallback_lyrics = f"""[Verse 1]
-This is a {genre} verse about {mood}
-Flowing through the rhythm and the beat
-Every word connects with your soul
-This is how we make it complete
-
-[Chorus]
-{mood.title()} vibes all around
-{genre} is the sound we found
-Let the music take control
-Feel it deep within your soul
-
-[Verse 2]
-Building on the energy we share
-Taking it higher everywhere
-This is more than just a song
-This is where we all belong"""
-        
-        lyrics_text = fallback_lyrics
+        lyrics_text = None
         provider = "fallback"
         
         # Try OpenAI if key available
-        if self.api_key:
+        client = _openai_client()
+        if client is not None:
             try:
-                client = OpenAI(api_key=self.api_key)
-                
                 beat_context_str = ""
                 if beat_context:
                     beat_context_str = f"\nBeat context: {beat_context.get('tempo', 'unknown')} BPM, {beat_context.get('key', 'unknown')} key, {beat_context.get('energy', 'medium')} energy"
@@ -212,59 +386,38 @@ Theme: {theme or 'general'}{beat_context_str}
 Provide complete lyrics with verse, chorus, and bridge sections.
 Make it authentic and emotionally resonant."""
                 
-                response = client.chat.completions.create(
+                response = await client.chat.completions.create(
                     model="gpt-4o-mini",
                     messages=[
-                        {"role": "system", "content": "You are a professional songwriter. Write authentic, emotionally resonant lyrics."},
+                        {"role": "system", "content": _SONG_SYSTEM_PROMPT},
                         {"role": "user", "content": prompt}
                     ],
                     temperature=0.9
                 )
                 
-                lyrics_text = response.choices[0].message.content.strip() if response.choices[0].message.content else fallback_lyrics
-                provider = "openai"
+                if response.choices[0].message.content:
+                    lyrics_text = response.choices[0].message.content.strip()
+                    provider = "openai"
             except Exception as e:
                 logger.warning(f"OpenAI lyrics failed: {e} - using fallback")
         
+        if lyrics_text is None:
+            # Static fallback lyrics
+            lyrics_text = _SONG_FALLBACK_TEMPLATE.format(genre=genre, mood=mood, mood_title=mood.title())
+        
         # Save lyrics.txt
         lyrics_file = session_path / "lyrics.txt"
-        with open(lyrics_file, 'w') as f:
-            f.write(lyrics_text)
-        
-        # Parse lyrics into structured sections (verse, chorus, bridge)
-        lyrics_lines = lyrics_text.split('\n')
-        parsed_lyrics = {"verse": "", "chorus": "", "bridge": ""}
-        current_section = None
-        
-        for line in lyrics_lines:
-            line_lower = line.lower().strip()
-            if '[verse' in line_lower or line_lower.startswith('verse'):
-                current_section = "verse"
-                continue
-            elif '[chorus' in line_lower or line_lower.startswith('chorus'):
-                current_section = "chorus"
-                continue
-            elif '[bridge' in line_lower or line_lower.startswith('bridge'):
-                current_section = "bridge"
-                continue
-            
-            if current_section and line.strip():
-                if parsed_lyrics[current_section]:
-                    parsed_lyrics[current_section] += "\n" + line.strip()
-                else:
-                    parsed_lyrics[current_section] = line.strip()
-        
-        # If no sections found, treat all as verse
-        if not any(parsed_lyrics.values()):
-            parsed_lyrics["verse"] = lyrics_text
+        async with aiofiles.open(lyrics_file, 'w') as f:
+            await f.write(lyrics_text)
         
         # Note: Voice generation is handled in the router since it uses gtts_speak
         # which is a main.py function. We'll handle it there.
         
         # Update project memory
         memory = await get_or_create_project_memory(session_id, MEDIA_DIR)
-        await memory.add_asset("lyrics", f"/media/{user_id}/{session_id}/lyrics.txt", {"genre": genre, "mood": mood})
-        await memory.advance_stage("lyrics", "upload")
+        async with memory.transaction():
+            await memory.add_asset("lyrics", f"/media/{user_id}/{session_id}/lyrics.txt", {"genre": genre, "mood": mood})
+            await memory.advance_stage("lyrics", "upload")
         
         log_endpoint_event("/songs/write", session_id, "success", {"provider": provider})
         
@@ -291,12 +444,12 @@ Make it authentic and emotionally resonant."""
         """
         session_path = get_session_media_path(session_id, user_id)
         
-        # Detect BPM and analyze mood
-        bpm = self.detect_bpm(beat_file_path)
-        mood = self.analyze_mood(beat_file_path)
+        # Detect BPM and analyze mood (aubio decodes the whole file - keep it off the event loop)
+        bpm = await asyncio.to_thread(self.detect_bpm, beat_file_path)
+        mood = await asyncio.to_thread(self.analyze_mood, beat_file_path)
         
         # Generate lyrics using NP22 template
-        lyrics_text = self.generate_np22_lyrics(theme=None, bpm=bpm, mood=mood)
+        lyrics_text = await self.generate_np22_lyrics(theme=None, bpm=bpm, mood=mood)
         
         # Prepare paths for saving lyrics
         lyrics_filename = "lyrics.txt"
@@ -304,14 +457,14 @@ Make it authentic and emotionally resonant."""
         project_path = session_path
         
         # Write lyrics to disk
-        with open(lyrics_path, "w", encoding="utf-8") as f:
-            f.write(lyrics_text)
+        async with aiofiles.open(lyrics_path, "w", encoding="utf-8") as f:
+            await f.write(lyrics_text)
         
         # Update project memory
         project_file = session_path / "project.json"
-        if project_file.exists():
-            with open(project_file, "r", encoding="utf-8") as f:
-                project = json.load(f)
+        if await asyncio.to_thread(project_file.exists):
+            async with aiofiles.open(project_file, "rb") as f:
+                project = orjson.loads(await f.read())
         else:
             project = {
                 "session_id": session_id,
@@ -324,8 +477,8 @@ Make it authentic and emotionally resonant."""
             project["lyrics"] = str(lyrics_path)
             project["lyrics_text"] = lyrics_text
             project["updated_at"] = datetime.now().isoformat()
-            with open(project_file, "w", encoding="utf-8") as f:
-                json.dump(project, f, indent=2)
+            async with aiofiles.open(project_file, "wb") as f:
+                await f.write(orjson.dumps(project, option=orjson.OPT_NON_STR_KEYS))
         
         # Auto-save to orchestrator
         orchestrator = ProjectOrchestrator(user_id, session_id)
@@ -355,13 +508,13 @@ Make it authentic and emotionally resonant."""
         Returns:
             Dict with lyrics
         """
-        lyrics_text = self.generate_np22_lyrics(theme=theme, bpm=None, mood=None)
+        lyrics_text = await self.generate_np22_lyrics(theme=theme, bpm=None, mood=None)
         
         log_endpoint_event("/lyrics/free", None, "success", {"theme": theme})
         
         return {"lyrics": lyrics_text}
     
-    async def refine_lyrics(
+    def _refine_messages(
         self,
         lyrics: str,
         instruction: str,
@@ -369,29 +522,14 @@ Make it authentic and emotionally resonant."""
         history: Optional[List[dict]] = None,
         structured_lyrics: Optional[Dict[str, str]] = None,
         rhythm_map: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-        """
-        Refine, rewrite, or extend lyrics based on user instructions.
-        
-        Returns:
-            Dict with refined lyrics
-        """
+    ) -> List[Dict[str, str]]:
+        """Chat messages for a refinement: the constant system prompt plus the per-request context"""
         # Parse structured lyrics if not provided
         if not structured_lyrics:
             structured_lyrics = self.parse_lyrics_to_structured(lyrics)
         
-        # Build prompt using NP22 template + original lyrics + user instruction + BPM if given
-        base_prompt = """You are an NP22-style lyric collaborator. Rewrite lyrics based on instruction while keeping:
-- NP22 style (cinematic soulful rock × modern trap)
-- dark-purple energy
-- mindset themes
-- melodic flow
-- stadium-level emotion
-
-Only modify what the instruction asks for. Keep original structure unless instruction says otherwise."""
-        
-        if bpm:
-            base_prompt += f"\n\nBPM: {bpm} - ensure the lyrics flow naturally with this tempo."
+        # Build the per-request context: original lyrics + structure + rhythm + history + BPM + instruction
+        bpm_info = f"\n\nBPM: {bpm} - ensure the lyrics flow naturally with this tempo." if bpm else ""
         
         # Add structured lyric information to prompt
         structure_info = ""
@@ -416,34 +554,48 @@ Only modify what the instruction asks for. Keep original structure unless instru
             history_context = "\n\nHere is recent conversation context:\n"
             for i, entry in enumerate(history, 1):
                 prev_lyrics_preview = entry.get('previousLyrics', '')[:100] + '...' if len(entry.get('previousLyrics', '')) > 100 else entry.get('previousLyrics', '')
-                instruction = entry.get('instruction', '')
-                history_context += f"{i}. User said: {instruction}\n"
+                past_instruction = entry.get('instruction', '')
+                history_context += f"{i}. User said: {past_instruction}\n"
                 history_context += f"   Previous lyrics: {prev_lyrics_preview}\n"
         
         user_prompt = f"""Original lyrics:
-{lyrics}{structure_info}{rhythm_info}{history_context}
-
-User instruction: {instruction}
+{lyrics}{structure_info}{rhythm_info}{history_context}{bpm_info}
 
-Rewrite the lyrics according to the instruction while maintaining NP22 style. Return only the revised lyrics as plain text (no JSON, no explanations)."""
+User instruction: {instruction}"""
+        
+        return [
+            {"role": "system", "content": _REFINE_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    async def refine_lyrics(
+        self,
+        lyrics: str,
+        instruction: str,
+        bpm: Optional[int] = None,
+        history: Optional[List[dict]] = None,
+        structured_lyrics: Optional[Dict[str, str]] = None,
+        rhythm_map: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Refine, rewrite, or extend lyrics based on user instructions.
         
+        Returns:
+            Dict with refined lyrics
+        """
         # Fallback: simple instruction-applied version
         fallback_lyrics = lyrics  # Keep original if refinement fails
         
-        if not self.api_key:
+        client = _openai_client()
+        if client is None:
             logger.warning("OpenAI API key not configured - returning original lyrics")
             log_endpoint_event("/lyrics/refine", None, "error", {"error": "OpenAI API key not configured"})
             return {"lyrics": fallback_lyrics}
         
         try:
-            client = OpenAI(api_key=self.api_key)
-            
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": base_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=self._refine_messages(lyrics, instruction, bpm, history, structured_lyrics, rhythm_map),
                 temperature=0.9
             )
             
@@ -455,4 +607,82 @@ Rewrite the lyrics according to the instruction while maintaining NP22 style. Re
             logger.warning(f"OpenAI lyrics refinement failed: {e} - returning original lyrics")
             log_endpoint_event("/lyrics/refine", None, "error", {"error": str(e)})
             raise Exception(f"Failed to refine lyrics: {str(e)}")
-
+    
+    async def submit_refine_batch(
+        self,
+        lyrics: str,
+        instruction: str,
+        bpm: Optional[int] = None,
+        history: Optional[List[dict]] = None,
+        structured_lyrics: Optional[Dict[str, str]] = None,
+        rhythm_map: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Queue a refinement for the OpenAI Batch API (half price, results within 24h).
+        
+        Returns:
+            Dict with job_id and status, or None if OpenAI is not configured
+        """
+        global _refine_batch_worker
+        if _openai_client() is None:
+            return None
+        
+        job_id = uuid.uuid4().hex
+        job = {"job_id": job_id, "status": "queued", "batch_id": None, "lyrics": None, "error": None}
+        await asyncio.to_thread(_write_refine_jobs, [job])
+        _cache_refine_job(job)
+        
+        if _refine_batch_worker is None or _refine_batch_worker.done():
+            _refine_batch_worker = asyncio.create_task(_run_refine_batches())
+        await _refine_batch_queue.put((job_id, self._refine_messages(lyrics, instruction, bpm, history, structured_lyrics, rhythm_map)))
+        
+        log_endpoint_event("/lyrics/refine", None, "success", {"deferred": True, "job_id": job_id})
+        return {"job_id": job_id, "status": "queued"}
+    
+    async def get_refine_batch_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Status of a deferred refinement, collecting the batch output once OpenAI has finished it.
+        
+        Returns:
+            Dict with job_id, status, batch_id, lyrics and error, or None if the job is unknown
+        """
+        job = await _load_refine_job(job_id)
+        if job is None:
+            return None
+        if job["status"] == "queued" or job["status"] in _REFINE_TERMINAL:
+            return job
+        
+        client = _openai_client()
+        batch = await client.batches.retrieve(job["batch_id"])
+        if batch.status == "completed" and batch.output_file_id:
+            output = await client.files.content(batch.output_file_id)
+            updated = []
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = orjson.loads(line)
+                batch_job = await _load_refine_job(entry.get("custom_id"))
+                if batch_job is None or batch_job["status"] in _REFINE_TERMINAL:
+                    continue
+                try:
+                    content = entry["response"]["body"]["choices"][0]["message"]["content"]
+                    batch_job.update(status="completed", lyrics=content.strip() if content else None)
+                except (KeyError, IndexError, TypeError):
+                    batch_job.update(status="failed", error=str(entry.get("error") or "No completion returned"))
+                updated.append(batch_job)
+            if job["status"] not in _REFINE_TERMINAL:
+                job.update(status="failed", error="Job missing from batch output")
+                updated.append(job)
+            await asyncio.to_thread(_write_refine_jobs, updated)
+        elif batch.status in ("failed", "expired", "cancelled"):
+            # Jobs of this batch that aren't in memory are marked when they are next polled
+            updated = [
+                batch_job for batch_job in _refine_jobs.values()
+                if batch_job["batch_id"] == job["batch_id"] and batch_job["status"] not in _REFINE_TERMINAL
+            ]
+            for batch_job in updated:
+                batch_job.update(status="failed", error=f"Batch {batch.status}")
+            await asyncio.to_thread(_write_refine_jobs, updated)
+        else:
+            job["batch_status"] = batch.status
+        return job
@@ -5,16 +5,24 @@ Clean backend using ONLY: Beatoven, OpenAI (text), Auphonic, GetLate, local serv
 
 import os
 import uuid
-import json
 import shutil
 import asyncio
+import mmap
+import re
+import time
 from pathlib import Path
 from typing import Optional, List
 from datetime import datetime
 import logging
+import logging.handlers
+import queue
 import zipfile
 
-from fastapi import FastAPI, APIRouter, Query, Depends
+import aiofiles
+import msgspec
+import orjson
+
+from fastapi import FastAPI, APIRouter, Query, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -22,7 +30,6 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from pydub import AudioSegment
 from PIL import Image
-import requests
 from datetime import timezone
 
 # Import local services
@@ -31,13 +38,14 @@ from content import content_router
 from auth import auth_router, get_current_user
 from routers.billing_router import billing_router
 from routers.beat_router import beat_router
+from services.beat_service import fetch_beatoven_credits, warm_silent_beat_library
 from routers.lyrics_router import lyrics_router
 from routers.media_router import media_router
 from routers.release_router import release_router, ReleaseRequest
 from routers.analytics_router import analytics_router
 from routers.social_router import social_router
 from utils.rate_limit import RateLimiterMiddleware
-from utils.shared_utils import require_feature_pro, get_session_media_path, log_endpoint_event, gtts_speak
+from utils.shared_utils import require_feature_pro, get_session_media_path, log_endpoint_event, gtts_speak, forget_voice_files, VoicePersona, get_http_client, close_http_client
 from backend.orchestrator import ProjectOrchestrator
 from database import init_db, get_db
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -47,26 +55,32 @@ from sqlalchemy.ext.asyncio import AsyncSession
 # ============================================================================
 
 # Logging setup - write ALL events to /logs/app.log
+# Request handlers only enqueue records; a QueueListener thread does the file and
+# stream writes, so log_endpoint_event never blocks the event loop on disk I/O
 LOGS_DIR = Path("./logs")
 LOGS_DIR.mkdir(exist_ok=True)
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.FileHandler(LOGS_DIR / "app.log"),
+    logging.StreamHandler()
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOGS_DIR / "app.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
 # Phase 1 normalized JSON response helpers - now from unified module
-from backend.utils.responses import success_response, error_response
+from backend.utils.responses import success_response, error_response, OrjsonJSONResponse
 
 # ============================================================================
 # FASTAPI APP SETUP
 # ============================================================================
 
-app = FastAPI(title="Label in a Box v4 - Phase 2.2")
+app = FastAPI(title="Label in a Box v4 - Phase 2.2", default_response_class=OrjsonJSONResponse)
 
 # Phase 1: Required API keys for startup validation
 REQUIRED_KEYS = [
@@ -95,9 +109,12 @@ app.add_middleware(RateLimiterMiddleware, requests_per_minute=30)
 def _is_render_env() -> bool:
     return bool(os.getenv("RENDER") or os.getenv("RENDER_EXTERNAL_URL") or os.getenv("RENDER_SERVICE_NAME"))
 
+# Environment does not change at runtime - evaluate once at import
+_IS_RENDER = _is_render_env()
+
 class EnforceHTTPSMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request, call_next):
-        if _is_render_env():
+        if _IS_RENDER:
             proto = request.headers.get("x-forwarded-proto", "")
             if proto and proto.lower() != "https":
                 return error_response("HTTPS required", status_code=403)
@@ -106,29 +123,32 @@ class EnforceHTTPSMiddleware(BaseHTTPMiddleware):
 app.add_middleware(EnforceHTTPSMiddleware)
 
 # Security headers middleware
+# Content-Security-Policy: Strict CSP to mitigate XSS risks
+# Allow self, inline scripts/styles (for frontend), and Beatoven API
+_CSP_HEADER = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "connect-src 'self' https://public-api.beatoven.ai; "
+    "img-src 'self' data: blob:; "
+    "font-src 'self' data:; "
+    "object-src 'none'; "
+    "base-uri 'self'; "
+    "form-action 'self';"
+)
+# Strict-Transport-Security: Enforce HTTPS for 1 year, include subdomains
+_HSTS_HEADER = "max-age=31536000; includeSubDomains"
+
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Add security headers to all responses: CSP, HSTS, X-Frame-Options, X-Content-Type-Options"""
     async def dispatch(self, request, call_next):
         response = await call_next(request)
         
-        # Content-Security-Policy: Strict CSP to mitigate XSS risks
-        # Allow self, inline scripts/styles (for frontend), and Beatoven API
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "connect-src 'self' https://public-api.beatoven.ai; "
-            "img-src 'self' data: blob:; "
-            "font-src 'self' data:; "
-            "object-src 'none'; "
-            "base-uri 'self'; "
-            "form-action 'self';"
-        )
+        response.headers["Content-Security-Policy"] = _CSP_HEADER
         
-        # Strict-Transport-Security: Enforce HTTPS for 1 year, include subdomains
-        # Only set in production (Render environment) where HTTPS is guaranteed
-        if _is_render_env():
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        # Only set HSTS in production (Render environment) where HTTPS is guaranteed
+        if _IS_RENDER:
+            response.headers["Strict-Transport-Security"] = _HSTS_HEADER
         
         # X-Frame-Options: Prevent clickjacking attacks
         response.headers["X-Frame-Options"] = "DENY"
@@ -144,8 +164,10 @@ app.add_middleware(SecurityHeadersMiddleware)
 MEDIA_DIR = Path("./media")
 ASSETS_DIR = Path("./assets")
 FRONTEND_DIST = Path("./frontend/dist")
+PROJECTS_ROOT = Path("./data/projects")
 MEDIA_DIR.mkdir(exist_ok=True)
 ASSETS_DIR.mkdir(exist_ok=True)
+PROJECTS_ROOT.mkdir(parents=True, exist_ok=True)
 (ASSETS_DIR / "demo").mkdir(exist_ok=True)
 
 # Serve static files
@@ -154,7 +176,7 @@ app.mount("/media", StaticFiles(directory=str(MEDIA_DIR)), name="media")
 # ============================================================================
 # API ROUTER WRAPPER (adds /api prefix for all endpoints)
 # ============================================================================
-api = APIRouter(prefix="/api")
+api = APIRouter(prefix="/api", default_response_class=OrjsonJSONResponse)
 
 # ============================================================================
 # STARTUP CHECKS - ENV KEYS (Phase 1)
@@ -179,6 +201,26 @@ async def validate_keys():
     else:
         logger.info("🔐 All API keys loaded successfully")
 
+# Shared httpx client: pooled keep-alive connections for all upstream API calls.
+# Built at startup; services fetch the same instance through get_http_client()
+@app.on_event("startup")
+async def open_http_client():
+    get_http_client()
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    await close_http_client()
+
+# Build the silent fallback-beat library in a worker thread; startup doesn't wait on ffmpeg
+@app.on_event("startup")
+async def warm_fallback_beats():
+    app.state.silent_beats_ready = asyncio.create_task(asyncio.to_thread(warm_silent_beat_library))
+
+# Flush queued log records before the process exits
+@app.on_event("shutdown")
+async def stop_log_listener():
+    _log_listener.stop()
+
 # Initialize database on startup
 @app.on_event("startup")
 async def initialize_database():
@@ -197,12 +239,12 @@ async def initialize_database():
 # - SocialPostRequest -> routers/social_router.py
 
 class VoiceSayRequest(BaseModel):
-    persona: str = Field(..., description="echo, lyrica, nova, tone, aria, vee, or pulse")
+    persona: VoicePersona = Field(..., description="echo, lyrica, nova, tone, aria, vee, or pulse")
     text: str
     session_id: Optional[str] = None
 
 # ============================================================================
-# VOICE DEBOUNCE SYSTEM (gTTS ONLY) - PHASE 2.2: 10s DEBOUNCE, SHA256 CACHE
+# VOICE DEBOUNCE SYSTEM (gTTS ONLY) - PHASE 2.2: 10s DEBOUNCE, BLAKE2b CACHE KEY
 # ============================================================================
 # Moved to utils/shared_utils.py
 
@@ -216,7 +258,7 @@ class VoiceSayRequest(BaseModel):
 # ============================================================================
 
 @api.get("/credits")
-def get_credits():
+async def get_credits():
     """Get remaining credits from Beatoven API - returns exactly {"credits": <number>}"""
     api_key = os.getenv("BEATOVEN_API_KEY") or os.getenv("BEATOVEN_KEY")
     
@@ -227,27 +269,11 @@ def get_credits():
         return JSONResponse(content={"credits": 10})
     
     try:
-        # Try to get credits from Beatoven API
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        credits_url = "https://public-api.beatoven.ai/api/v1/usage"
-        try:
-            credits_res = requests.get(credits_url, headers=headers, timeout=10)
-            if credits_res.ok:
-                credits_data = credits_res.json()
-                credits = credits_data.get("credits", credits_data.get("remaining", 10))
-                log_endpoint_event("/credits", None, "success", {"credits": credits, "source": "beatoven"})
-                return JSONResponse(content={"credits": credits})
-        except:
-            pass
-        
-        # Fallback: return default credits
-        logger.warning("Beatoven credits API not available – using fallback default")
-        log_endpoint_event("/credits", None, "success", {"credits": 10, "source": "fallback"})
-        return JSONResponse(content={"credits": 10})
+        credits, source = await fetch_beatoven_credits(api_key)
+        if source == "fallback":
+            logger.warning("Beatoven credits API not available – using fallback default")
+        log_endpoint_event("/credits", None, "success", {"credits": credits, "source": source})
+        return JSONResponse(content={"credits": credits})
     except Exception as e:
         logger.warning(f"Failed to get Beatoven credits: {e}")
         log_endpoint_event("/credits", None, "error", {"error": str(e)})
@@ -271,37 +297,19 @@ async def get_beat_credits():
         )
     
     try:
-        # Try to get credits from Beatoven API
-        # Note: Beatoven API may not have a direct credits endpoint
-        # This is a placeholder that checks if API key is valid
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+        # Note: Beatoven API may not have a direct credits endpoint; the usage
+        # endpoint is tried and a default value is returned when unavailable
+        credits, source = await fetch_beatoven_credits(api_key)
+        log_endpoint_event("/beats/credits", None, "success", {"credits": credits, "source": source})
+        if source == "beatoven":
+            return success_response(
+                data={"credits": credits},
+                message="Credits retrieved from Beatoven"
+            )
         
-        # Check if Beatoven has a usage/credits endpoint
-        # For now, return a default value since Beatoven API documentation
-        # doesn't clearly specify a credits endpoint
-        # In production, this should call the actual Beatoven credits API if available
-        credits_url = "https://public-api.beatoven.ai/api/v1/usage"
-        try:
-            credits_res = requests.get(credits_url, headers=headers, timeout=10)
-            if credits_res.ok:
-                credits_data = credits_res.json()
-                credits = credits_data.get("credits", credits_data.get("remaining", 10))
-                log_endpoint_event("/beats/credits", None, "success", {"credits": credits, "source": "beatoven"})
-                return success_response(
-                    data={"credits": credits},
-                    message="Credits retrieved from Beatoven"
-                )
-        except:
-            pass
-        
-        # Fallback: return default credits
         logger.warning("Beatoven credits API not available – using fallback default")
-        log_endpoint_event("/beats/credits", None, "success", {"credits": 10, "source": "fallback"})
         return success_response(
-            data={"credits": 10},
+            data={"credits": credits},
             message="Credits retrieved (fallback)"
         )
     except Exception as e:
@@ -416,9 +424,9 @@ async def get_content_ideas(request: ReleaseRequest):
 
 @api.post("/voices/say")
 async def voice_say(request: VoiceSayRequest, current_user: dict = Depends(get_current_user)):
-    """Phase 2.2: Make an AI persona speak using gTTS (10s debounce, SHA256)"""
+    """Phase 2.2: Make an AI persona speak using gTTS (10s debounce, hashed file cache)"""
     try:
-        result = gtts_speak(request.persona, request.text, request.session_id, current_user["user_id"])
+        result = await gtts_speak(request.persona, request.text, request.session_id, current_user["user_id"])
         return result
     except Exception as e:
         log_endpoint_event("/voices/say", request.session_id, "error", {"error": str(e)})
@@ -510,49 +518,206 @@ class ProjectSaveRequest(BaseModel):
 class ProjectLoadRequest(BaseModel):
     projectId: str
 
+class ProjectRecord(msgspec.Struct):
+    """On-disk record for a saved project, stored as MessagePack"""
+    projectId: str = ""
+    userId: str = ""
+    name: str = "Untitled Project"
+    projectData: dict = {}
+    updatedAt: str = ""
+    createdAt: Optional[str] = None
+
+# projectIds are server-generated uuid4 strings; anything else (e.g. "../x") is rejected
+# before it can reach a filesystem path, so no resolve() is needed
+_PROJECT_ID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+PROJECT_FILE_SUFFIX = ".msgpack"
+# Projects saved before the MessagePack switch are still readable
+LEGACY_PROJECT_FILE_SUFFIX = ".json"
+
+# Per-user /projects/list cache: user_id -> (dir_mtime_ns, cached_at, entries)
+# Invalidated when the directory mtime changes, on save, or after the TTL
+_PROJECTS_LIST_TTL = 5.0  # seconds
+_projects_list_cache: dict[str, tuple[int, float, list]] = {}
+
+# Per-user manifest of {projectId: {projectId, name, updatedAt}} so listing
+# and quota checks read one file instead of every project file
+PROJECT_INDEX_FILENAME = "_index.json"
+_project_index_locks: dict[str, asyncio.Lock] = {}
+# user_ids whose PROJECTS_ROOT subdirectory is known to exist in this process
+_known_project_dirs: set[str] = set()
+
+
+def _decode_project_record(project_file: Path, raw: bytes) -> ProjectRecord:
+    """Decode a project file, MessagePack or legacy JSON depending on its suffix"""
+    if project_file.suffix == PROJECT_FILE_SUFFIX:
+        record = msgspec.msgpack.decode(raw, type=ProjectRecord)
+    else:
+        record = msgspec.json.decode(raw, type=ProjectRecord)
+    if not record.projectId:
+        record.projectId = project_file.stem
+    return record
+
+
+def _read_project_record_sync(project_file: Path) -> ProjectRecord:
+    """Decode straight from a read-only mmap of the file instead of copying it into a buffer first"""
+    with open(project_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _decode_project_record(project_file, b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _decode_project_record(project_file, mm)
+
+
+async def _read_project_record(project_file: Path) -> ProjectRecord:
+    # mmap page faults still block, so decode in a worker thread
+    return await asyncio.to_thread(_read_project_record_sync, project_file)
+
+
+async def _stat_project_file(projects_dir: Path, project_id: str) -> Optional[tuple[Path, os.stat_result]]:
+    """Locate and stat a project's file, preferring the MessagePack record over a legacy JSON one"""
+    for suffix in (PROJECT_FILE_SUFFIX, LEGACY_PROJECT_FILE_SUFFIX):
+        project_file = projects_dir / f"{project_id}{suffix}"
+        try:
+            return project_file, await asyncio.to_thread(project_file.stat)
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def _mtime_etag(mtime_ns: int) -> str:
+    # Every write goes through os.replace, so the mtime changes whenever the content does
+    return f'W/"{mtime_ns:x}"'
+
+
+def _etag_matches(http_request: Request, etag: str) -> bool:
+    if_none_match = http_request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in if_none_match.split(","))
+
+
+async def _read_project_summary(project_file: Path) -> dict:
+    """Read one project file and return its manifest entry"""
+    record = await _read_project_record(project_file)
+    return {
+        "projectId": record.projectId,
+        "name": record.name,
+        "updatedAt": record.updatedAt
+    }
+
+
+async def _build_project_index(projects_dir: Path) -> dict:
+    """Build the manifest by scanning project files (users saved before the index existed)"""
+    project_files = [
+        p for p in await asyncio.to_thread(list, projects_dir.iterdir())
+        if p.suffix in (PROJECT_FILE_SUFFIX, LEGACY_PROJECT_FILE_SUFFIX) and p.name != PROJECT_INDEX_FILENAME
+    ]
+    summaries = await asyncio.gather(
+        *(_read_project_summary(p) for p in project_files),
+        return_exceptions=True
+    )
+    
+    index = {}
+    for project_file, summary in zip(project_files, summaries):
+        if isinstance(summary, Exception):
+            logger.error(f"Error loading project {project_file}: {summary}")
+            continue
+        index[summary["projectId"]] = summary
+    return index
+
+
+async def _load_project_index(projects_dir: Path) -> dict:
+    """Read the user's project manifest, rebuilding it from disk if missing"""
+    index_file = projects_dir / PROJECT_INDEX_FILENAME
+    try:
+        async with aiofiles.open(index_file, 'rb') as f:
+            return orjson.loads(await f.read())
+    except FileNotFoundError:
+        index = await _build_project_index(projects_dir)
+        await _write_project_index(projects_dir, index)
+        return index
+
+
+async def _write_file_atomic(path: Path, payload: bytes):
+    """
+    Write to a sibling temp file and rename it over the target, so readers
+    never observe a partially written file. No fsync: the rename is atomic,
+    and losing the last save on power failure is acceptable here.
+    """
+    temp_file = path.with_name(path.name + ".tmp")
+    async with aiofiles.open(temp_file, 'wb') as f:
+        await f.write(payload)
+    await asyncio.to_thread(os.replace, temp_file, path)
+
+
+async def _write_project_index(projects_dir: Path, index: dict):
+    """Atomically replace the user's project manifest"""
+    await _write_file_atomic(projects_dir / PROJECT_INDEX_FILENAME, orjson.dumps(index))
+
 @api.post("/projects/save")
 async def save_project(request: ProjectSaveRequest, current_user: dict = Depends(get_current_user)):
     """Save project data to user's project folder"""
+    if request.projectId is not None and not _PROJECT_ID_RE.fullmatch(request.projectId):
+        return error_response("invalid_project_id", 400, "Invalid project id")
     try:
         user_id = current_user["user_id"]
         user_plan = current_user.get("plan", "free")
+        now_iso = datetime.now(timezone.utc).isoformat()
         
         # Generate projectId if not provided
         project_id = request.projectId or str(uuid.uuid4())
         
-        # PHASE 8.4: Free tier limit enforcement - max 1 project
-        if user_plan == "free":
-            projects_dir = Path("./data/projects") / user_id
-            if projects_dir.exists():
-                existing_projects = list(projects_dir.glob("*.json"))
-                # If this is a new project (not updating existing), check limit
-                if not request.projectId and len(existing_projects) >= 1:
-                    log_endpoint_event("/projects/save", project_id, "upgrade_required", {"user_id": user_id, "limit": "multi_project"})
-                    return error_response("upgrade_required", status_code=403)
-        
-        # Create user's project directory
-        projects_dir = Path("./data/projects") / user_id
-        projects_dir.mkdir(parents=True, exist_ok=True)
+        # Create user's project directory once per process (a brand-new directory has no projects to index)
+        projects_dir = PROJECTS_ROOT / user_id
+        is_new_dir = False
+        if user_id not in _known_project_dirs:
+            try:
+                await asyncio.to_thread(projects_dir.mkdir)
+                is_new_dir = True
+            except FileExistsError:
+                pass
+            _known_project_dirs.add(user_id)
         
-        # Save project data
-        project_file = projects_dir / f"{project_id}.json"
-        
-        # Extract name from projectData or use default
-        project_name = request.projectData.get("metadata", {}).get("track_title") or "Untitled Project"
-        
-        project_save_data = {
-            "projectId": project_id,
-            "userId": user_id,
-            "name": project_name,
-            "projectData": request.projectData,
-            "updatedAt": datetime.now().isoformat(),
-            "createdAt": request.projectData.get("created_at", datetime.now().isoformat())
-        }
+        async with _project_index_locks.setdefault(user_id, asyncio.Lock()):
+            index = {} if is_new_dir else await _load_project_index(projects_dir)
+            
+            # PHASE 8.4: Free tier limit enforcement - max 1 project
+            # If this is a new project (not updating existing), check limit
+            if user_plan == "free" and not request.projectId and index:
+                log_endpoint_event("/projects/save", project_id, "upgrade_required", {"user_id": user_id, "limit": "multi_project"})
+                return error_response("upgrade_required", status_code=403)
+            
+            # Save project data
+            project_file = projects_dir / f"{project_id}{PROJECT_FILE_SUFFIX}"
+            
+            # Extract name from projectData or use default
+            project_name = request.projectData.get("metadata", {}).get("track_title") or "Untitled Project"
+            
+            record = ProjectRecord(
+                projectId=project_id,
+                userId=user_id,
+                name=project_name,
+                projectData=request.projectData,
+                updatedAt=now_iso,
+                createdAt=request.projectData.get("created_at", now_iso)
+            )
+            
+            await _write_file_atomic(project_file, msgspec.msgpack.encode(record))
+            if request.projectId:
+                # Drop the pre-MessagePack copy so it can't shadow this save
+                legacy_file = projects_dir / f"{project_id}{LEGACY_PROJECT_FILE_SUFFIX}"
+                await asyncio.to_thread(legacy_file.unlink, missing_ok=True)
+            
+            index[project_id] = {
+                "projectId": project_id,
+                "name": project_name,
+                "updatedAt": now_iso
+            }
+            await _write_project_index(projects_dir, index)
         
-        with open(project_file, 'w') as f:
-            json.dump(project_save_data, f, indent=2)
+        _projects_list_cache.pop(user_id, None)
         
-        log_endpoint_event("/projects/save", project_id, "success", {"user_id": user_id})
+        log_endpoint_event("/projects/save", project_id, "success", {"user_id": user_id}, now_iso=now_iso)
         return success_response(
             data={"projectId": project_id, "name": project_name},
             message="Project saved successfully"
@@ -563,61 +728,86 @@ async def save_project(request: ProjectSaveRequest, current_user: dict = Depends
         return error_response(f"Failed to save project: {str(e)}")
 
 @api.get("/projects/list")
-async def list_user_projects(current_user: dict = Depends(get_current_user)):
-    """List all projects for the current user"""
+async def list_user_projects(http_request: Request, current_user: dict = Depends(get_current_user)):
+    """List all projects for the current user (ETag from the project directory mtime)"""
     try:
         user_id = current_user["user_id"]
-        projects_dir = Path("./data/projects") / user_id
+        projects_dir = PROJECTS_ROOT / user_id
         
         projects = []
-        if projects_dir.exists():
-            for project_file in projects_dir.glob("*.json"):
-                try:
-                    with open(project_file, 'r') as f:
-                        data = json.load(f)
-                        projects.append({
-                            "projectId": data.get("projectId", project_file.stem),
-                            "name": data.get("name", "Untitled Project"),
-                            "updatedAt": data.get("updatedAt", "")
-                        })
-                except Exception as e:
-                    logger.error(f"Error loading project {project_file}: {e}")
+        etag = None
+        try:
+            dir_mtime = (await asyncio.to_thread(projects_dir.stat)).st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime = None
+        if dir_mtime is not None:
+            etag = _mtime_etag(dir_mtime)
+            if _etag_matches(http_request, etag):
+                log_endpoint_event("/projects/list", None, "not_modified", {"user_id": user_id})
+                return Response(status_code=304, headers={"ETag": etag})
+            
+            now = time.monotonic()
+            cached = _projects_list_cache.get(user_id)
+            if cached and cached[0] == dir_mtime and now - cached[1] < _PROJECTS_LIST_TTL:
+                projects = cached[2]
+                log_endpoint_event("/projects/list", None, "success", {"user_id": user_id, "count": len(projects), "cached": True})
+                response = success_response(data={"projects": projects}, message="Projects listed successfully")
+                response.headers["ETag"] = etag
+                return response
+            
+            async with _project_index_locks.setdefault(user_id, asyncio.Lock()):
+                index = await _load_project_index(projects_dir)
+            projects = list(index.values())
         
         # Sort by updatedAt descending
         projects.sort(key=lambda x: x.get("updatedAt", ""), reverse=True)
+        if dir_mtime is not None:
+            _projects_list_cache[user_id] = (dir_mtime, now, projects)
         
         log_endpoint_event("/projects/list", None, "success", {"user_id": user_id, "count": len(projects)})
-        return success_response(data={"projects": projects}, message="Projects listed successfully")
+        response = success_response(data={"projects": projects}, message="Projects listed successfully")
+        if etag:
+            response.headers["ETag"] = etag
+        return response
     except Exception as e:
         logger.error(f"Failed to list projects: {e}")
         log_endpoint_event("/projects/list", None, "error", {"error": str(e)})
         return error_response(f"Failed to list projects: {str(e)}")
 
 @api.post("/projects/load")
-async def load_project(request: ProjectLoadRequest, current_user: dict = Depends(get_current_user)):
-    """Load a specific project"""
+async def load_project(request: ProjectLoadRequest, http_request: Request, current_user: dict = Depends(get_current_user)):
+    """Load a specific project (ETag from the project file mtime)"""
+    if not _PROJECT_ID_RE.fullmatch(request.projectId):
+        return error_response("invalid_project_id", 400, "Invalid project id")
     try:
         user_id = current_user["user_id"]
         project_id = request.projectId
         
-        projects_dir = Path("./data/projects") / user_id
-        project_file = projects_dir / f"{project_id}.json"
+        projects_dir = PROJECTS_ROOT / user_id
+        found = await _stat_project_file(projects_dir, project_id)
         
-        if not project_file.exists():
+        if found is None:
             return error_response("Project not found", status_code=404)
         
-        with open(project_file, 'r') as f:
-            data = json.load(f)
+        project_file, project_stat = found
+        etag = _mtime_etag(project_stat.st_mtime_ns)
+        if _etag_matches(http_request, etag):
+            log_endpoint_event("/projects/load", project_id, "not_modified", {"user_id": user_id})
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        record = await _read_project_record(project_file)
         
         log_endpoint_event("/projects/load", project_id, "success", {"user_id": user_id})
-        return success_response(
+        response = success_response(
             data={
-                "projectData": data.get("projectData", {}),
-                "projectId": data.get("projectId", project_id),
-                "name": data.get("name", "Untitled Project")
+                "projectData": record.projectData,
+                "projectId": record.projectId,
+                "name": record.name
             },
             message="Project loaded successfully"
         )
+        response.headers["ETag"] = etag
+        return response
     except Exception as e:
         logger.error(f"Failed to load project: {e}")
         log_endpoint_event("/projects/load", request.projectId, "error", {"error": str(e)})
@@ -633,7 +823,7 @@ class ProjectLoadRequestPhase6(BaseModel):
 @api.post("/project/load")
 async def load_project(request: ProjectLoadRequestPhase6, current_user: dict = Depends(get_current_user)):
     orchestrator = ProjectOrchestrator(current_user["user_id"], request.session_id)
-    state = await asyncio.to_thread(orchestrator.get_full_state)
+    state = await orchestrator.get_full_state()
     if not state:
         return error_response("PROJECT_NOT_FOUND", 404, "Project not found")
     return success_response(data=state)
@@ -641,28 +831,33 @@ async def load_project(request: ProjectLoadRequestPhase6, current_user: dict = D
 @api.get("/project/state/{session_id}")
 async def get_project_state(session_id: str, current_user: dict = Depends(get_current_user)):
     orchestrator = ProjectOrchestrator(current_user["user_id"], session_id)
-    state = await asyncio.to_thread(orchestrator.get_full_state)
+    state = await orchestrator.get_full_state()
     return success_response(data=state)
 
 @api.post("/project/reset")
 async def reset_project(request: ProjectLoadRequestPhase6, current_user: dict = Depends(get_current_user)):
     orchestrator = ProjectOrchestrator(current_user["user_id"], request.session_id)
-    await asyncio.to_thread(orchestrator.reset_project)
+    await orchestrator.reset_project()
+    # Reset wipes the session media folder, including generated voices
+    forget_voice_files(current_user["user_id"], request.session_id)
     return success_response(message="Project reset.")
 
 # ============================================================================
 # INCLUDE API ROUTER
 # ============================================================================
-app.include_router(api)
-app.include_router(auth_router)
-app.include_router(content_router)
-app.include_router(billing_router)
-app.include_router(beat_router)
-app.include_router(lyrics_router)
-app.include_router(media_router)
-app.include_router(release_router)
-app.include_router(analytics_router)
-app.include_router(social_router)
+for router in (
+    api,
+    auth_router,
+    content_router,
+    billing_router,
+    beat_router,
+    lyrics_router,
+    media_router,
+    release_router,
+    analytics_router,
+    social_router,
+):
+    app.include_router(router)
 
 # ============================================================================
 # FRONTEND SERVING (MUST BE LAST - AFTER ALL API ROUTES)
@@ -670,10 +865,11 @@ app.include_router(social_router)
 
 # Serve frontend in production (if built)
 # IMPORTANT: Mount order matters - this must be after all API routes
-if FRONTEND_DIST.exists():
+if FRONTEND_DIST.is_dir():
     # Serve frontend assets (CSS, JS, images)
-    if (FRONTEND_DIST / "assets").exists():
-        app.mount("/assets", StaticFiles(directory=str(FRONTEND_DIST / "assets")), name="assets")
+    frontend_assets = FRONTEND_DIST / "assets"
+    if frontend_assets.is_dir():
+        app.mount("/assets", StaticFiles(directory=str(frontend_assets)), name="assets")
     
     # Serve frontend static files (HTML, CSS, JS) - catch-all route (must be last)
     app.mount("/", StaticFiles(directory=str(FRONTEND_DIST), html=True), name="frontend")
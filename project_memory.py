@@ -5,12 +5,15 @@ Persistent, contextual memory system for AI voices
 
 import json
 import os
+import uuid
 import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
 import aiofiles
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +39,8 @@ class ProjectMemory:
         self.session_path.mkdir(parents=True, exist_ok=True)
         self.project_file = self.session_path / "project.json"
         self.project_data = None  # Will be loaded asynchronously
+        self._batch_depth = 0  # > 0 while inside transaction()
+        self._batch_dirty = False
     
     async def _load_or_create(self) -> Dict:
         """Load existing project or create new one"""
@@ -118,14 +123,34 @@ class ProjectMemory:
     
     async def save(self):
         """Save project data to disk"""
+        if self._batch_depth:
+            # Inside transaction(): write once when the outermost block exits
+            self._batch_dirty = True
+            return
         self.project_data["updated_at"] = datetime.now().isoformat()
         # Ensure user_id is included
         if self.user_id:
             self.project_data["user_id"] = self.user_id
-        async with aiofiles.open(self.project_file, 'w') as f:
-            await f.write(json.dumps(self.project_data, indent=2))
+        # Compact single-buffer write; the file is only ever machine-read.
+        # Written to a temp file and swapped in so readers never see a partial project.json
+        temp_file = self.project_file.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+        async with aiofiles.open(temp_file, 'wb') as f:
+            await f.write(orjson.dumps(self.project_data, option=orjson.OPT_NON_STR_KEYS))
+        await asyncio.to_thread(os.replace, temp_file, self.project_file)
         logger.info(f"Project memory saved for session {self.session_id}")
     
+    @asynccontextmanager
+    async def transaction(self):
+        """Coalesce the saves of several updates into a single write at the end of the block"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_dirty:
+                self._batch_dirty = False
+                await self.save()
+    
     async def update_metadata(self, **kwargs):
         """Update project metadata"""
         for key, value in kwargs.items():
@@ -307,6 +332,44 @@ async def get_or_create_project_memory(session_id: str, media_dir: Path, user_id
     memory.project_data = await memory._load_or_create()
     return memory
 
+# Serialises load-modify-save cycles per session so concurrent background updates don't drop each other's changes.
+# Entries are reference-counted and removed once no task holds or waits on the lock
+_session_locks: Dict[tuple, asyncio.Lock] = {}
+_session_lock_users: Dict[tuple, int] = {}
+
+
+@asynccontextmanager
+async def _session_lock(key: tuple):
+    """Hold the per-session lock, dropping its entry when the last user leaves"""
+    lock = _session_locks.setdefault(key, asyncio.Lock())
+    _session_lock_users[key] = _session_lock_users.get(key, 0) + 1
+    try:
+        async with lock:
+            yield
+    finally:
+        _session_lock_users[key] -= 1
+        if not _session_lock_users[key]:
+            del _session_lock_users[key]
+            del _session_locks[key]
+
+
+async def record_stage_assets(session_id: str, media_dir: Path, assets: List[tuple], completed_stage: Optional[str] = None,
+                              next_stage: Optional[str] = None, user_id: Optional[str] = None):
+    """
+    Add (asset_type, file_url, metadata) assets and advance the workflow stage (if given) in a single write.
+    Scheduled through FastAPI BackgroundTasks so upload/mix responses don't wait on project.json.
+    """
+    try:
+        async with _session_lock((user_id, session_id)):
+            memory = await get_or_create_project_memory(session_id, media_dir, user_id)
+            async with memory.transaction():
+                for asset_type, file_url, metadata in assets:
+                    await memory.add_asset(asset_type, file_url, metadata)
+                if completed_stage:
+                    await memory.advance_stage(completed_stage, next_stage)
+    except Exception as e:
+        logger.error(f"Failed to record {completed_stage or 'project'} assets for session {session_id}: {e}")
+
 async def list_all_projects(media_dir: Path) -> List[Dict]:
     """List all projects with their metadata"""
     projects = []
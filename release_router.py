@@ -2,6 +2,7 @@
 Release Router - API endpoints for release pack generation
 """
 import os
+import asyncio
 import shutil
 import zipfile
 from pathlib import Path
@@ -81,6 +82,15 @@ release_service = ReleaseService()
 MEDIA_DIR = Path("./media")
 
 
+def _find_mixed_file(session_path: Path) -> Optional[Path]:
+    """First existing mixed/mastered WAV for the session, or None"""
+    for filename in ["mix/mixed_mastered.wav", "mix.wav", "master.wav", "release/audio/mixed_mastered.wav"]:
+        candidate_path = session_path / filename
+        if candidate_path.exists():
+            return candidate_path
+    return None
+
+
 @release_router.post("/cover")
 async def generate_release_cover(
     request: ReleaseCoverRequest,
@@ -303,21 +313,18 @@ async def build_release_pack(request: ReleaseBuildRequest):
         
         # Find mixed file
         session_path = get_session_media_path(request.session_id, request.user_id)
-        mixed_file_path = None
         
         # Try to find mixed/mastered file
-        for filename in ["mix/mixed_mastered.wav", "mix.wav", "master.wav", "release/audio/mixed_mastered.wav"]:
-            candidate_path = session_path / filename
-            if candidate_path.exists():
-                mixed_file_path = candidate_path
-                break
+        mixed_file_path = await asyncio.to_thread(_find_mixed_file, session_path)
         
-        if not mixed_file_path or not mixed_file_path.exists():
+        if not mixed_file_path:
             log_endpoint_event("/release/build", request.session_id, "error", {"error": "MISSING_FIELD", "field": "mixed_file"})
             return error_response("MISSING_FIELD", 400, "Missing required field: mixed_file", data={"field": "mixed_file"})
         
-        # Build release pack
-        result = release_service.build_release_pack(
+        # Build release pack - file copies, audio analysis and cover rendering all block,
+        # so run it on a worker thread and keep the event loop serving other requests
+        result = await asyncio.to_thread(
+            release_service.build_release_pack,
             session_id=request.session_id,
             title=request.title,
             artist=request.artist,
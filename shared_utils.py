@@ -3,13 +3,18 @@ Shared utility functions for routers and services
 """
 import os
 import json
+import asyncio
 import logging
 import time
 import hashlib
+import importlib.util
+import shutil
 import uuid
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Callable, Any, Awaitable
+from typing import Optional, Callable, Any, Awaitable, Literal
 from datetime import datetime
+import httpx
 from gtts import gTTS
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -43,9 +48,55 @@ try:
 except ImportError:
     logger.warning("⚠️ redis package not installed. Caching will fall back to direct execution.")
 
-# Voice debounce system (gTTS ONLY) - PHASE 2.2: 10s DEBOUNCE, SHA256 CACHE
+# edge-tts synthesizes natively async; gTTS remains the fallback engine
+try:
+    import edge_tts
+    _edge_tts_available = True
+except ImportError:
+    edge_tts = None
+    _edge_tts_available = False
+    logger.warning("⚠️ edge-tts package not installed. Voice synthesis will fall back to gTTS.")
+
+# HTTP/2 lets Beatoven status polls and the track download share one multiplexed connection
+# (httpx imports h2 itself when http2=True; only its presence is checked here)
+_http2_available = importlib.util.find_spec("h2") is not None
+if not _http2_available:
+    logger.warning("⚠️ h2 package not installed. Outbound HTTP will use HTTP/1.1 keep-alive.")
+
+# Shared outbound HTTP client - one keep-alive pool for Beatoven and other upstream APIs,
+# so repeat calls skip the TCP/TLS handshake and never block the event loop
+_http_client: Optional[httpx.AsyncClient] = None
+
+# ffmpeg/ffprobe resolved once, so each spawn execs the binary directly instead of searching PATH
+FFMPEG_BIN = shutil.which("ffmpeg") or "ffmpeg"
+FFPROBE_BIN = shutil.which("ffprobe") or "ffprobe"
+
+# Voice debounce system - PHASE 2.2: 10s DEBOUNCE, BLAKE2b CACHE KEY
+# key -> last spoken time; kept in recency order so the oldest entries sit at the front
 _voice_debounce_cache: dict[str, float] = {}
 _voice_debounce_seconds = 10.0  # Phase 2.2: 10-second debounce
+_VOICE_DEBOUNCE_MAX = 4096
+
+# Persona-specific accents (using only gTTS-supported TLDs)
+_GTTS_TLD: dict[str, str] = {
+    "nova": "com", "echo": "co.uk", "lyrica": "com.au",
+    "tone": "ca", "aria": "co.in", "vee": "com", "pulse": "co.za"
+}
+# edge-tts neural voices matching each persona's gTTS accent
+_EDGE_VOICE: dict[str, str] = {
+    "nova": "en-US-AriaNeural", "echo": "en-GB-SoniaNeural", "lyrica": "en-AU-NatashaNeural",
+    "tone": "en-CA-ClaraNeural", "aria": "en-IN-NeerjaNeural", "vee": "en-US-JennyNeural",
+    "pulse": "en-ZA-LeahNeural"
+}
+VoicePersona = Literal["echo", "lyrica", "nova", "tone", "aria", "vee", "pulse"]
+
+# URL paths of voice files known to exist on disk, so repeat requests skip the
+# mkdir + stat calls. Insertion-ordered dict used as a bounded FIFO set.
+_voice_file_cache: dict[str, None] = {}
+_VOICE_FILE_CACHE_MAX = 4096
+# One lock per voice file being synthesized, so concurrent duplicate requests
+# wait for the first synthesis instead of racing on the same output path
+_voice_locks: dict[str, asyncio.Lock] = {}
 
 
 async def get_cached(key: str, fallback_func: Callable[[], Awaitable[Any]], ttl_seconds: int) -> Any:
@@ -107,6 +158,26 @@ async def get_cached(key: str, fallback_func: Callable[[], Awaitable[Any]], ttl_
         raise
 
 
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide httpx client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=_http2_available,
+            timeout=httpx.Timeout(30, connect=10),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=300)
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared httpx client (called on app shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 async def require_feature_pro(current_user: dict, feature: str, endpoint: str, db: AsyncSession):
     """
     Feature gate: block free users from specific features, but allow trial users.
@@ -160,77 +231,139 @@ async def require_feature_pro(current_user: dict, feature: str, endpoint: str, d
     )
 
 
+@lru_cache(maxsize=4096)
+def _ensure_session_dir(path: Path) -> Path:
+    """mkdir a session directory once per process; later calls skip the syscall"""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
 def get_session_media_path(session_id: str, user_id: str) -> Path:
     """
     Phase 8B:
     User-scoped media path. No backward compatibility.
     """
-    path = Path("./media") / user_id / session_id
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return _ensure_session_dir(Path("./media") / user_id / session_id)
 
 
-def log_endpoint_event(endpoint: str, session_id: Optional[str] = None, result: str = "success", details: Optional[dict] = None):
-    """Log endpoint execution to app.log"""
+def log_endpoint_event(endpoint: str, session_id: Optional[str] = None, result: str = "success", details: Optional[dict] = None, now_iso: Optional[str] = None):
+    """Log endpoint execution to app.log (pass now_iso to reuse a timestamp the caller already computed)"""
     log_data = {
         "endpoint": endpoint,
         "session_id": session_id or "none",
         "result": result,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso or datetime.now().isoformat()
     }
     if details:
         log_data.update(details)
     logger.info(f"{endpoint} | session={session_id} | {result} | {json.dumps(details or {})}")
 
 
-def should_speak(persona: str, text: str) -> bool:
-    """Phase 2.2: Debounce with 10-second window and SHA256 key"""
-    # SHA256 cache key (Phase 2.2 requirement)
-    key = hashlib.sha256(f"{persona}:{text}".encode()).hexdigest()
+def _voice_key(persona: str, text: str) -> str:
+    """Cache/debounce key for a persona line (128-bit BLAKE2b - not security sensitive)"""
+    return hashlib.blake2b(f"{persona}:{text}".encode(), digest_size=16).hexdigest()
+
+
+def should_speak(key: str) -> bool:
+    """Phase 2.2: Debounce with 10-second window, keyed by _voice_key()"""
     now = time.time()
     last_time = _voice_debounce_cache.get(key, 0)
     if now - last_time < _voice_debounce_seconds:
         return False
+    # Re-insert so the dict stays ordered by last use
+    _voice_debounce_cache.pop(key, None)
     _voice_debounce_cache[key] = now
+    if len(_voice_debounce_cache) > _VOICE_DEBOUNCE_MAX:
+        _sweep_voice_debounce_cache(now)
     return True
 
 
-def gtts_speak(persona: str, text: str, session_id: Optional[str] = None, user_id: Optional[str] = None):
-    """Phase 2.2: Generate speech using gTTS with SHA256 cache and 10s debounce"""
+def _sweep_voice_debounce_cache(now: float):
+    """Evict expired entries (they no longer debounce anything), then the oldest until under the cap"""
+    cutoff = now - _voice_debounce_seconds
+    for key, last_time in list(_voice_debounce_cache.items()):
+        if last_time >= cutoff and len(_voice_debounce_cache) <= _VOICE_DEBOUNCE_MAX:
+            break
+        del _voice_debounce_cache[key]
+
+
+def _remember_voice_file(url_path: str):
+    _voice_file_cache[url_path] = None
+    if len(_voice_file_cache) > _VOICE_FILE_CACHE_MAX:
+        _voice_file_cache.pop(next(iter(_voice_file_cache)))
+
+
+def forget_voice_files(user_id: str, session_id: str):
+    """Drop cached voice file entries for a session whose media was deleted"""
+    prefix = f"/media/{user_id}/{session_id}/"
+    for url_path in [p for p in _voice_file_cache if p.startswith(prefix)]:
+        del _voice_file_cache[url_path]
+
+
+def _voice_output_file(session_id: str, user_id: str, cache_key: str) -> Path:
+    """Create the session's voices dir and return the target path for a voice file"""
+    voices_dir = get_session_media_path(session_id, user_id) / "voices"
+    voices_dir.mkdir(exist_ok=True, parents=True)
+    return voices_dir / f"{cache_key}.mp3"
+
+
+def _gtts_save(persona: VoicePersona, text: str, output_file: Path):
+    # persona is validated as a VoicePersona upstream
+    tts = gTTS(text=text, lang="en", tld=_GTTS_TLD[persona], slow=False)
+    tts.save(str(output_file))
+
+
+async def _ensure_voice_file(persona: VoicePersona, text: str, session_id: str, user_id: str, cache_key: str):
+    """Synthesize the voice file if missing: edge-tts first, blocking gTTS in a thread as fallback"""
+    output_file = await asyncio.to_thread(_voice_output_file, session_id, user_id, cache_key)
+    if await asyncio.to_thread(output_file.exists):
+        return
+    
+    if _edge_tts_available:
+        try:
+            await edge_tts.Communicate(text, voice=_EDGE_VOICE[persona]).save(str(output_file))
+            return
+        except Exception as e:
+            logger.warning(f"edge-tts synthesis failed for {persona}: {e}. Falling back to gTTS.")
+            # Don't leave a truncated file behind for the exists() check to trust
+            await asyncio.to_thread(output_file.unlink, missing_ok=True)
+    
+    await asyncio.to_thread(_gtts_save, persona, text, output_file)
+
+
+async def gtts_speak(persona: VoicePersona, text: str, session_id: Optional[str] = None, user_id: Optional[str] = None):
+    """Phase 2.2: Generate speech (edge-tts, gTTS fallback) with hashed file cache and 10s debounce"""
     # Generate session_id if not provided
     if not session_id:
         session_id = str(uuid.uuid4())
     
-    # Generate SHA256 cache key (Phase 2.2 requirement)
-    cache_key = hashlib.sha256(f"{persona}:{text}".encode()).hexdigest()
+    # One key serves both the debounce window and the on-disk file name
+    cache_key = _voice_key(persona, text)
     
-    # Create voices directory
     if not user_id:
         raise ValueError("user_id is required for gtts_speak")
-    voices_dir = get_session_media_path(session_id, user_id) / "voices"
-    voices_dir.mkdir(exist_ok=True, parents=True)
     
-    output_file = voices_dir / f"{cache_key}.mp3"
+    # Construct URL path relative to media directory
+    url_path = f"/media/{user_id}/{session_id}/voices/{cache_key}.mp3"
     
     # Check debounce (but still return URL to cached file)
-    is_debounced = not should_speak(persona, text)
+    is_debounced = not should_speak(cache_key)
     
     try:
-        # Generate if not cached on disk
-        if not output_file.exists():
-            # Persona-specific accents (using only gTTS-supported TLDs)
-            tld_map = {
-                "nova": "com", "echo": "co.uk", "lyrica": "com.au",
-                "tone": "ca", "aria": "co.in", "vee": "com", "pulse": "co.za"
-            }
-            tld = tld_map.get(persona, "com")
-            
-            tts = gTTS(text=text, lang="en", tld=tld, slow=False)
-            tts.save(str(output_file))
+        # Generate if not cached on disk (known-present files skip the filesystem entirely)
+        if url_path not in _voice_file_cache:
+            lock = _voice_locks.setdefault(url_path, asyncio.Lock())
+            try:
+                async with lock:
+                    # A concurrent request may have finished this file while we waited
+                    if url_path not in _voice_file_cache:
+                        await _ensure_voice_file(persona, text, session_id, user_id, cache_key)
+                        _remember_voice_file(url_path)
+            finally:
+                # Later requests hit _voice_file_cache; current waiters keep their reference
+                if _voice_locks.get(url_path) is lock:
+                    del _voice_locks[url_path]
         
         # Return URL whether debounced or not (spec requires playable asset)
-        # Construct URL path relative to media directory
-        url_path = f"/media/{user_id}/{session_id}/voices/{cache_key}.mp3"
         log_endpoint_event("/voices/say", session_id, "success", {"persona": persona, "cached": is_debounced})
         return success_response(
             data={
@@ -0,0 +1,66 @@
+"""
+Tests for /projects/save and /projects/load project id validation
+"""
+import pytest
+import httpx
+
+import main
+from auth import get_current_user
+
+
+BAD_PROJECT_IDS = [
+    "../x",
+    "../../etc/passwd",
+    "..",
+    "a/b",
+    "/tmp/evil",
+    "00000000-0000-0000-0000-000000000000/../../x",
+    "not-a-uuid",
+]
+
+
+@pytest.fixture
+async def client(tmp_path, monkeypatch):
+    """
+    ASGI client for the app with authentication stubbed out and project
+    storage redirected to a temporary directory.
+    """
+    monkeypatch.setattr(main, "PROJECTS_ROOT", tmp_path / "projects")
+    main.app.dependency_overrides[get_current_user] = lambda: {"user_id": "user123", "plan": "pro"}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+    main.app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("project_id", BAD_PROJECT_IDS)
+async def test_save_rejects_traversal_project_id(client, tmp_path, project_id):
+    """
+    Test that /projects/save refuses project ids that are not server-generated uuids.
+
+    This test verifies:
+    - The request is rejected with 400 / invalid_project_id
+    - Nothing is written under (or outside) the projects root
+    """
+    response = await client.post(
+        "/api/projects/save",
+        json={"projectId": project_id, "userId": "user123", "projectData": {"name": "x"}}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error"] == "invalid_project_id"
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("project_id", BAD_PROJECT_IDS)
+async def test_load_rejects_traversal_project_id(client, project_id):
+    """
+    Test that /projects/load refuses project ids that are not server-generated uuids,
+    before any filesystem lookup happens.
+    """
+    response = await client.post("/api/projects/load", json={"projectId": project_id})
+
+    assert response.status_code == 400
+    assert response.json()["error"] == "invalid_project_id"
@@ -1,20 +1,29 @@
+import os
 from typing import Optional
 from fastapi import UploadFile, HTTPException
 
 
-ALLOWED_AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac")
+ALLOWED_AUDIO_EXTENSIONS = frozenset({".wav", ".mp3", ".flac"})
 MAX_AUDIO_BYTES = 50 * 1024 * 1024  # 50 MB
 
 
+def validate_audio_extension(file: UploadFile) -> str:
+    """
+    Raise HTTPException if the file extension is not an allowed audio type; returns the lowercased extension.
+    Does not touch the upload stream, so callers can enforce size while streaming.
+    """
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    if ext not in ALLOWED_AUDIO_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Invalid audio file. Only .wav, .mp3, .flac allowed")
+    return ext
+
+
 async def validate_audio_file(file: UploadFile) -> None:
     """
     Raise HTTPException if file extension or size is invalid.
     Ensures the UploadFile stream is reset after reading.
     """
-    filename = file.filename or ""
-    lower = filename.lower()
-    if not lower.endswith(ALLOWED_AUDIO_EXTENSIONS):
-        raise HTTPException(status_code=400, detail="Invalid audio file. Only .wav, .mp3, .flac allowed")
+    validate_audio_extension(file)
 
     # Read bytes to validate size; then reset
     content = await file.read()